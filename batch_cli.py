@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+Headless batch processing (no Qt)
+--------------------------------------------------------------------------------
+Imports data files (any format in loaders.registry) and runs
+Processor.clean_semg and Processor.mvc_matlab on every channel, one file
+per worker process, for nightly reprocessing on machines without a display.
+
+Usage:
+    python batch_cli.py data/ --out results/
+    python batch_cli.py "data/**/*.mat" --out results/ --workers 8
+    python batch_cli.py data/ --ext .mat --ext .c3d --out results/
+
+Writes, under --out:
+    <file>.npz   envelopes (clean_semg), movingrms, mvc, labels, fs
+    mvc.csv      one row per (file, channel): path, label, mvc
+    best.json    the BEST_OF highest MVC trials per label
+Exits with status 1 if any file failed.
+================================================================================
+"""
+
+from __future__ import annotations
+import argparse, csv, glob, json, logging, os, sys, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+
+from config.defaults import BEST_OF, DEFAULT_SEMG_FREQUENCY
+from loaders.registry import load_trial
+from processors.batch import select_best
+from processors.processors import Processor
+
+log = logging.getLogger("batch")
+
+
+# ------------------------------------------------------------------------------
+# 1. Inputs
+# ------------------------------------------------------------------------------
+def collect_paths(inputs: list[str], exts: list[str] = (".mat",)) -> list[str]:
+    """Expand directories (recursively, files with ``exts``) and globs to a sorted, unique list."""
+    exts = {e.lower() for e in exts}
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.update(str(p) for p in Path(item).rglob("*") if p.suffix.lower() in exts)
+        else:
+            paths.update(p for p in glob.glob(item, recursive=True) if os.path.isfile(p))
+    return sorted(paths)
+
+
+def output_name(path: str, root: str) -> str:
+    """Result file name that keeps files with the same name in different folders apart."""
+    rel = os.path.relpath(os.path.splitext(path)[0], root)
+    return rel.replace(os.sep, "__").replace("..", "_") + ".npz"
+
+
+# ------------------------------------------------------------------------------
+# 2. Worker
+# ------------------------------------------------------------------------------
+def process_file(path: str, out_path: str, winsize: int, rms_ms: float,
+                 hampel_ms: float, use_cache: bool) -> dict:
+    """Process one file; module level so it can run in a worker process."""
+    trial = load_trial(path)
+    if not trial:
+        raise ValueError("no variable in file")
+    data = np.atleast_2d(np.asarray(trial["data"], dtype=float))
+    fs = trial.get("fs") or DEFAULT_SEMG_FREQUENCY
+    labels = list(trial["labels"])     # one per channel (loaders.trial.make_trial)
+
+    p = Processor(winsize)
+    cache = None
+    if use_cache:
+        from processors.cache import ResultCache
+        try:
+            cache = ResultCache()
+        except OSError as e:
+            log.warning("Result cache unavailable, processing without it: %s", e)
+    if cache is not None:
+        envelopes = cache.clean_semg(path, data, p, fs, rms_ms, hampel_ms)
+        mvc, movingrms = cache.mvc(path, data, p)
+    else:
+        envelopes = p.clean_semg_batch(data, fs, rms_ms, hampel_ms)
+        mvc, movingrms = p.mvc_matlab_batch(data)
+
+    tmp = out_path + ".tmp.npz"
+    np.savez(tmp, envelopes=envelopes, movingrms=movingrms, mvc=mvc,
+             labels=np.array(labels), fs=fs)
+    os.replace(tmp, out_path)
+    return {"path": path, "labels": labels, "mvc": [float(v) for v in mvc]}
+
+
+# ------------------------------------------------------------------------------
+# 3. Driver
+# ------------------------------------------------------------------------------
+def run(paths: list[str], out_dir: str, workers: int, winsize: int = 3,
+        rms_ms: float = 50, hampel_ms: float = 50, best_of: int = BEST_OF,
+        use_cache: bool = True) -> int:
+    """Process ``paths`` into ``out_dir``; return the number of failed files."""
+    os.makedirs(out_dir, exist_ok=True)
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths])
+    results, failed = {}, 0
+    t0 = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(process_file, path,
+                        os.path.join(out_dir, output_name(os.path.abspath(path), root)),
+                        winsize, rms_ms, hampel_ms, use_cache): path
+            for path in paths
+        }
+        for done, fut in enumerate(as_completed(futures), start=1):
+            path = futures[fut]
+            try:
+                results[path] = fut.result()
+                log.info("[%d/%d] %s", done, len(paths), path)
+            except Exception as e:
+                failed += 1
+                log.error("[%d/%d] %s: %s", done, len(paths), path, e)
+
+    values = {}
+    with open(os.path.join(out_dir, "mvc.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["path", "label", "mvc"])
+        for path in paths:                       # input order, not completion order
+            if path not in results:
+                continue
+            for label, mvc in zip(results[path]["labels"], results[path]["mvc"]):
+                writer.writerow([path, label, repr(mvc)])
+                values.setdefault(label, []).append((path, mvc))
+
+    best = select_best(values, best_of)
+    with open(os.path.join(out_dir, "best.json"), "w", encoding="utf-8") as f:
+        json.dump({label: [{"path": p, "mvc": v} for p, v in trials]
+                   for label, trials in best.items()}, f, indent=2)
+
+    log.info("%d file(s) processed, %d failed in %.1f s -> %s",
+             len(results), failed, time.perf_counter() - t0, out_dir)
+    return failed
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description="Headless sEMG batch processing (clean_semg + MVC).")
+    ap.add_argument("inputs", nargs="+", help="data files, directories or glob patterns")
+    ap.add_argument("--ext", action="append", help="extension to collect from directories "
+                    "(repeatable; default .mat)")
+    ap.add_argument("--out", "-o", required=True, help="output directory")
+    ap.add_argument("--workers", "-j", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--winsize", type=int, default=3, help="mvc_matlab RMS half-window")
+    ap.add_argument("--rms-ms", type=float, default=50)
+    ap.add_argument("--hampel-ms", type=float, default=50)
+    ap.add_argument("--best-of", type=int, default=BEST_OF)
+    ap.add_argument("--no-cache", action="store_true", help="do not use the processed-trial cache")
+    ap.add_argument("--quiet", "-q", action="store_true")
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO,
+                        format="%(asctime)s [%(levelname)s] %(message)s")
+    paths = collect_paths(args.inputs, args.ext or [".mat"])
+    if not paths:
+        log.error("No data files found in %s", " ".join(args.inputs))
+        return 2
+    failed = run(paths, args.out, max(1, args.workers), args.winsize, args.rms_ms,
+                 args.hampel_ms, args.best_of, use_cache=not args.no_cache)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
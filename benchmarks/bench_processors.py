@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+Benchmark suite for processors/processors.py
+--------------------------------------------------------------------------------
+Times every Processor stage on synthetic signals at DEFAULT_SEMG_FREQUENCY
+and 44.1 kHz, for lengths from 10^3 to 10^7 samples:
+✓ Wall time (best of --repeat runs)
+✓ Peak memory (tracemalloc; NumPy buffers are traced)
+✓ Scaling exponent per case (slope of log time vs log n)
+✓ Baseline JSON to --save, and --compare against a saved baseline
+✓ --check-memory asserts the documented peak of clean_semg_lowmem
+
+Usage:
+    python benchmarks/bench_processors.py --max-length 1e6
+    python benchmarks/bench_processors.py --save baseline.json
+    python benchmarks/bench_processors.py --compare baseline.json --tolerance 0.25
+
+--compare exits with status 1 when any case is slower than the baseline
+by more than --tolerance (cases under --noise-floor seconds are ignored).
+================================================================================
+"""
+
+from __future__ import annotations
+import argparse, json, math, platform, sys, time, tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import numpy as np
+import scipy
+
+from config.defaults import DEFAULT_SEMG_FREQUENCY
+from processors.lowmem import LOWMEM_OVERHEAD_BYTES
+from processors.processors import Processor
+
+AUDIO_FREQUENCY = 44100
+DEFAULT_LENGTHS = [10**3, 10**4, 10**5, 10**6, 10**7]
+
+
+# ------------------------------------------------------------------------------
+# 1. Synthetic signals
+# ------------------------------------------------------------------------------
+def semg_signal(n: int, fs: float, seed: int = 0) -> np.ndarray:
+    """Gaussian noise modulated by 1 s on/off contractions, plus sparse spikes."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) / fs
+    envelope = 0.05 + (np.sin(2 * np.pi * 0.5 * t) > 0)
+    x = rng.standard_normal(n) * envelope * 200.0
+    spikes = rng.random(n) < 1e-4
+    x[spikes] += 5000.0
+    return x
+
+
+def semg_signal_f32(n: int, fs: float, seed: int = 0) -> np.ndarray:
+    return semg_signal(n, fs, seed).astype(np.float32)
+
+
+def audio_signal(n: int, fs: float, seed: int = 0) -> np.ndarray:
+    """440 Hz tone bursts of random length separated by silence."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) / fs
+    gate = np.repeat(rng.random(n // int(0.1 * fs) + 1) < 0.5, int(0.1 * fs))[:n]
+    return np.sin(2 * np.pi * 440 * t) * gate + rng.standard_normal(n) * 1e-3
+
+
+# ------------------------------------------------------------------------------
+# 2. Cases: name -> (fs, signal factory, call)
+# ------------------------------------------------------------------------------
+def build_cases(fs_semg: float = DEFAULT_SEMG_FREQUENCY, fs_audio: float = AUDIO_FREQUENCY):
+    p = Processor()
+    cases = {}
+    for fs in (fs_semg, fs_audio):
+        tag = f"@{int(fs)}"
+        cases["bandpass" + tag] = (fs, semg_signal, lambda x, fs=fs: Processor.bandpass(x, fs, lo=50, hi=min(500, 0.45 * fs)))
+        cases["moving_rms" + tag] = (fs, semg_signal, lambda x, fs=fs: Processor.moving_rms(x, max(1, int(fs * 0.05))))
+    cases[f"hampel_filter@{int(fs_semg)}"] = (fs_semg, semg_signal, lambda x: Processor.hampel_filter(x, int(fs_semg * 0.05) | 1))
+    cases[f"moving_rms_matlab@{int(fs_semg)}"] = (fs_semg, semg_signal, lambda x: p.moving_rms_matlab(x, p.winsize))
+    cases[f"clean_semg@{int(fs_semg)}"] = (fs_semg, semg_signal, lambda x: p.clean_semg(x, fs_semg))
+    cases[f"clean_semg_lowmem@{int(fs_semg)}"] = (fs_semg, semg_signal_f32, lambda x: p.clean_semg_lowmem(x, fs_semg))
+    cases[f"mvc_matlab@{int(fs_semg)}"] = (fs_semg, semg_signal, lambda x: p.mvc_matlab(x))
+    cases[f"energy_detection@{int(fs_audio)}"] = (fs_audio, audio_signal, lambda x: p.energy_detection(x, fs=fs_audio))
+    return cases
+
+
+# ------------------------------------------------------------------------------
+# 3. Measurement
+# ------------------------------------------------------------------------------
+def measure(call, x, repeat: int) -> tuple[float, int]:
+    """Best wall time over `repeat` runs, then one traced run for peak memory."""
+    best = math.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        call(x)
+        best = min(best, time.perf_counter() - t0)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    call(x)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def scaling_exponent(points: list[tuple[int, float]], floor: float = 1e-3) -> float | None:
+    """Least-squares slope of log(seconds) vs log(n), ignoring timings under `floor`."""
+    pts = [(n, s) for n, s in points if s >= floor]
+    if len(pts) < 2:
+        return None
+    logn = np.log([n for n, _ in pts])
+    logs = np.log([s for _, s in pts])
+    return float(np.polyfit(logn, logs, 1)[0])
+
+
+def run_suite(lengths, only=None, repeat=3, verbose=True) -> dict:
+    cases = build_cases()
+    results = []
+    for name, (fs, factory, call) in cases.items():
+        if only and not any(name.startswith(o) for o in only):
+            continue
+        for n in lengths:
+            x = factory(n, fs)
+            try:
+                seconds, peak = measure(call, x, repeat if n < 10**6 else 1)
+            except Exception as e:
+                # e.g. a window longer than the signal; keep the rest of the suite going
+                tracemalloc.stop()
+                if verbose:
+                    print(f"{name:<28} n={n:>9,d}  skipped: {e}")
+                continue
+            results.append({"case": name, "n": n, "seconds": seconds, "peak_bytes": peak,
+                            "input_bytes": x.nbytes})
+            if verbose:
+                print(f"{name:<28} n={n:>9,d}  {seconds * 1e3:>10.2f} ms  "
+                      f"peak {peak / 2**20:>8.1f} MiB ({peak / x.nbytes:.1f}x input)")
+            del x
+
+    scaling = {}
+    for name in dict.fromkeys(r["case"] for r in results):
+        scaling[name] = scaling_exponent([(r["n"], r["seconds"]) for r in results if r["case"] == name])
+
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "scipy": scipy.__version__,
+            "machine": platform.platform(),
+            "cpu": platform.processor(),
+        },
+        "results": results,
+        "scaling": scaling,
+    }
+
+
+# ------------------------------------------------------------------------------
+# 4. Baseline comparison
+# ------------------------------------------------------------------------------
+def compare(current: dict, baseline: dict, tolerance: float, noise_floor: float) -> list[str]:
+    """Return human-readable regressions of `current` against `baseline`."""
+    base = {(r["case"], r["n"]): r for r in baseline["results"]}
+    regressions = []
+    for r in current["results"]:
+        b = base.get((r["case"], r["n"]))
+        if not b or b["seconds"] < noise_floor:
+            continue
+        ratio = r["seconds"] / b["seconds"]
+        if ratio > 1 + tolerance:
+            regressions.append(f"{r['case']} n={r['n']:,d}: {b['seconds'] * 1e3:.2f} ms -> "
+                               f"{r['seconds'] * 1e3:.2f} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def check_lowmem_peak(current: dict) -> list[str]:
+    """clean_semg_lowmem must stay within its documented bound (processors.lowmem)."""
+    failures = []
+    for r in current["results"]:
+        if r["case"].startswith("clean_semg_lowmem"):
+            bound = 3 * r["input_bytes"] + LOWMEM_OVERHEAD_BYTES
+            if r["peak_bytes"] > bound:
+                failures.append(f"{r['case']} n={r['n']:,d}: peak {r['peak_bytes'] / 2**20:.1f} MiB "
+                                f"> bound {bound / 2**20:.1f} MiB")
+    return failures
+
+
+def print_scaling(scaling: dict) -> None:
+    print("\nScaling (time ~ n^k):")
+    for name, k in scaling.items():
+        print(f"  {name:<28} k = {'n/a' if k is None else f'{k:.2f}'}")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmark processors.Processor")
+    ap.add_argument("--lengths", type=float, nargs="+", default=DEFAULT_LENGTHS,
+                    help="Signal lengths in samples (default 1e3 .. 1e7)")
+    ap.add_argument("--max-length", type=float, default=None, help="Drop lengths above this")
+    ap.add_argument("--only", nargs="+", default=None, help="Case name prefixes to run")
+    ap.add_argument("--repeat", type=int, default=3, help="Runs per case below 1e6 samples")
+    ap.add_argument("--save", type=Path, default=None, help="Write results as baseline JSON")
+    ap.add_argument("--compare", type=Path, default=None, help="Baseline JSON to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown (0.25 = 25%%)")
+    ap.add_argument("--check-memory", action="store_true",
+                    help="Fail if clean_semg_lowmem exceeds its documented peak memory")
+    ap.add_argument("--noise-floor", type=float, default=1e-3, help="Ignore baseline timings below (s)")
+    args = ap.parse_args(argv)
+
+    lengths = sorted({int(n) for n in args.lengths if args.max_length is None or n <= args.max_length})
+    current = run_suite(lengths, only=args.only, repeat=args.repeat)
+    print_scaling(current["scaling"])
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(current, indent=2), encoding="utf-8")
+        print(f"\nBaseline written to {args.save}")
+
+    status = 0
+    if args.check_memory:
+        failures = check_lowmem_peak(current)
+        for line in failures:
+            print("❌ " + line)
+        status = 1 if failures else 0
+        if not failures:
+            print("\n✅ clean_semg_lowmem within its peak-memory bound")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(current, baseline, args.tolerance, args.noise_floor)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) vs {args.compare}:")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print(f"\n✅ No regressions vs {args.compare}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
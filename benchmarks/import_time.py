@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+================================================================================
+Import-time report and startup budget for main.py
+--------------------------------------------------------------------------------
+Starts a fresh interpreter that imports main, runs main.init_session,
+creates the QApplication and builds ApplicationWindow, as the app does
+before the event loop:
+✓ Time to ApplicationWindow (best of --repeat fresh processes), per stage
+✓ `python -X importtime` report: slowest modules by cumulative and own time
+✓ Modules that must not load at startup (scipy, pandas, h5py, dialogs,
+  processors, loaders — they load on first use)
+✓ --budget-ms fails when time to ApplicationWindow exceeds the budget
+✓ Baseline JSON to --save, and --compare against a saved baseline
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --budget-ms 400 --top 30
+    python benchmarks/import_time.py --save startup.json
+    python benchmarks/import_time.py --compare startup.json --tolerance 0.25
+
+Exits with status 1 when the budget is exceeded, a forbidden module is
+imported at startup, or a stage is slower than the baseline by more than
+--tolerance. The window is built on Qt's "offscreen" platform unless
+--platform says otherwise. Interpreter start-up itself is not counted.
+================================================================================
+"""
+
+from __future__ import annotations
+import argparse, json, os, platform, subprocess, sys
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Time to ApplicationWindow; about 145 ms measured on Linux (offscreen)
+DEFAULT_BUDGET_MS = 400.0
+
+# Must stay off the startup path; each loads on first use
+FORBIDDEN_AT_STARTUP = ("pandas", "scipy", "h5py", "dialogs", "processors", "loaders")
+
+RESULT_PREFIX = "IMPORT_TIME_RESULT "
+
+# Runs in the child interpreter, cwd = project root. The session logs to a
+# temporary directory so runs do not append to the project's logs/app.log.
+CHILD = f"""
+import os, tempfile, time
+log_dir = tempfile.mkdtemp(prefix="import_time-")
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+main.LOG_DIR, main.LOGFILE = log_dir, os.path.join(log_dir, "app.log")
+main.init_session([])
+t2 = time.perf_counter()
+from PyQt5 import QtWidgets
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(["import_time"])
+t3 = time.perf_counter()
+win = main.ApplicationWindow()
+t4 = time.perf_counter()
+import json, logging, shutil, sys
+main.LOG_PIPELINE.stop()
+logging.shutdown()
+shutil.rmtree(log_dir, ignore_errors=True)
+sys.__stdout__.write({RESULT_PREFIX!r} + json.dumps({{
+    "stages": {{"import_main": t1 - t0, "init_session": t2 - t1,
+                "qapplication": t3 - t2, "application_window": t4 - t3}},
+    "total": t4 - t0,
+    "modules": sorted(sys.modules),
+}}) + "\\n")
+sys.__stdout__.flush()
+"""
+
+
+# ------------------------------------------------------------------------------
+# 1. Child runs
+# ------------------------------------------------------------------------------
+def run_child(qt_platform: str | None, importtime: bool = False) -> tuple[dict, str]:
+    """Run CHILD once; return its result dict and stderr (the -X importtime log)."""
+    env = dict(os.environ)
+    if qt_platform:
+        env["QT_QPA_PLATFORM"] = qt_platform
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", CHILD]
+    proc = subprocess.run(cmd, cwd=PROJECT_ROOT, env=env, capture_output=True,
+                          text=True, encoding="utf-8", errors="replace")
+    lines = [l for l in proc.stdout.splitlines() if l.startswith(RESULT_PREFIX)]
+    if proc.returncode != 0 or not lines:
+        tail = "\n".join(proc.stderr.splitlines()[-15:])
+        raise RuntimeError(f"startup run failed (exit {proc.returncode}):\n{tail}")
+    return json.loads(lines[-1][len(RESULT_PREFIX):]), proc.stderr
+
+
+def parse_importtime(log: str) -> list[dict]:
+    """Rows of `-X importtime` output: {"module", "self_us", "cumulative_us", "depth"}."""
+    rows = []
+    for line in log.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        rows.append({"module": name.strip(), "self_us": int(self_us), "cumulative_us": int(cum_us),
+                     "depth": (len(name) - len(name.lstrip()) - 1) // 2})
+    return rows
+
+
+def forbidden_modules(modules, forbidden=FORBIDDEN_AT_STARTUP) -> list[str]:
+    return [m for m in modules if any(m == f or m.startswith(f + ".") for f in forbidden)]
+
+
+def measure(repeat: int, qt_platform: str | None) -> dict:
+    """Best-of-``repeat`` stage times (fresh process each) plus one -X importtime run."""
+    runs = [run_child(qt_platform)[0] for _ in range(repeat)]
+    best = min(runs, key=lambda r: r["total"])
+    traced, log = run_child(qt_platform, importtime=True)
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "cpu": platform.processor(),
+            "qt_platform": qt_platform,
+            "repeat": repeat,
+        },
+        "total": best["total"],
+        "stages": best["stages"],
+        "modules": traced["modules"],
+        "imports": parse_importtime(log),
+    }
+
+
+# ------------------------------------------------------------------------------
+# 2. Report
+# ------------------------------------------------------------------------------
+def print_report(current: dict, top: int) -> None:
+    print(f"Time to ApplicationWindow: {current['total'] * 1e3:8.1f} ms "
+          f"(best of {current['meta']['repeat']})")
+    for name, seconds in current["stages"].items():
+        print(f"  {name:<24} {seconds * 1e3:8.1f} ms")
+
+    rows = current["imports"]
+    print(f"\n{len(current['modules'])} modules loaded; "
+          f"-X importtime total {sum(r['self_us'] for r in rows) / 1e3:.1f} ms")
+    print(f"\nTop {top} by cumulative time (includes what they import):")
+    for r in sorted(rows, key=lambda r: r["cumulative_us"], reverse=True)[:top]:
+        print(f"  {r['cumulative_us'] / 1e3:8.1f} ms  {'  ' * r['depth']}{r['module']}")
+    print(f"\nTop {top} by own time:")
+    for r in sorted(rows, key=lambda r: r["self_us"], reverse=True)[:top]:
+        print(f"  {r['self_us'] / 1e3:8.1f} ms  {r['module']}")
+
+
+# ------------------------------------------------------------------------------
+# 3. Budget and baseline
+# ------------------------------------------------------------------------------
+def compare(current: dict, baseline: dict, tolerance: float, noise_floor: float) -> list[str]:
+    """Return human-readable regressions of `current` against `baseline`."""
+    pairs = [("total", current["total"], baseline.get("total"))]
+    pairs += [(k, v, baseline.get("stages", {}).get(k)) for k, v in current["stages"].items()]
+    regressions = []
+    for name, now, then in pairs:
+        if not then or then < noise_floor:
+            continue
+        ratio = now / then
+        if ratio > 1 + tolerance:
+            regressions.append(f"{name}: {then * 1e3:.1f} ms -> {now * 1e3:.1f} ms ({ratio:.2f}x)")
+    new = sorted(set(current["modules"]) - set(baseline.get("modules", current["modules"])))
+    if new:
+        print(f"\n{len(new)} module(s) imported at startup that the baseline did not:")
+        for m in new[:20]:
+            print("  " + m)
+    return regressions
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Report import time and check the startup budget")
+    ap.add_argument("--repeat", type=int, default=3, help="Fresh processes timed (best is kept)")
+    ap.add_argument("--top", type=int, default=20, help="Modules listed per table")
+    ap.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                    help="Fail above this time to ApplicationWindow (0 disables)")
+    ap.add_argument("--platform", default="offscreen",
+                    help="QT_QPA_PLATFORM for the child ('' keeps the environment's)")
+    ap.add_argument("--save", type=Path, default=None, help="Write results as baseline JSON")
+    ap.add_argument("--compare", type=Path, default=None, help="Baseline JSON to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown (0.25 = 25%%)")
+    ap.add_argument("--noise-floor", type=float, default=5e-3, help="Ignore baseline stages below (s)")
+    args = ap.parse_args(argv)
+
+    current = measure(max(1, args.repeat), args.platform or None)
+    print_report(current, args.top)
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps(current, indent=2), encoding="utf-8")
+        print(f"\nBaseline written to {args.save}")
+
+    status = 0
+    loaded = forbidden_modules(current["modules"])
+    if loaded:
+        print(f"\n❌ Imported at startup but should load on first use: {', '.join(loaded[:10])}"
+              + (" ..." if len(loaded) > 10 else ""))
+        status = 1
+
+    total_ms = current["total"] * 1e3
+    if args.budget_ms and total_ms > args.budget_ms:
+        print(f"\n❌ Time to ApplicationWindow {total_ms:.1f} ms exceeds the budget of {args.budget_ms:.0f} ms")
+        status = 1
+    elif args.budget_ms:
+        print(f"\n✅ Time to ApplicationWindow {total_ms:.1f} ms within the budget of {args.budget_ms:.0f} ms")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(current, baseline, args.tolerance, args.noise_floor)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) vs {args.compare}:")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print(f"\n✅ No regressions vs {args.compare}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
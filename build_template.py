@@ -195,6 +195,7 @@ CONDAENVIRONMENTFILENAME = "{CONDAENVIRONMENTFILENAME}"
         ("resources", "resources"),
         ("utilities", "utilities"),
         ("processors", "processors"),
+        ("loaders", "loaders"),
     ]
     for src, dest in data_dirs:
         src_path = project_root / src
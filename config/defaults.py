@@ -1,2 +1,11 @@
 DEFAULT_SEMG_FREQUENCY = 1500
-BEST_OF = 3 
\ No newline at end of file
+SEMG_BAND = (50.0, 500.0)   # sEMG bandpass (Hz) for every cleaning path and cache key
+BEST_OF = 3 
+IMPORT_PARALLEL = True
+IMPORT_MAX_WORKERS = 4   # files parsed at once; bounds import memory
+IMPORT_CACHE = True        # keep binary sidecars of imported MAT files
+IMPORT_CACHE_BYTES = 4 * 2**30
+IMPORT_SHARED_MEMORY = True  # parallel import returns matrices through shared memory
+LOG_QUEUE_SIZE = 10000     # records buffered for the logging thread
+LOG_QUEUE_OVERFLOW = "drop_oldest"   # or "drop_new", "block"
+METRICS_ENABLED = False    # timing spans (View > Metrics); also --metrics
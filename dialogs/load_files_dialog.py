@@ -3,30 +3,56 @@ from PyQt5.QtCore import Qt, pyqtSignal, pyqtSlot, QThread, QObject, QCoreApplic
 from PyQt5.QtWidgets import QDialog, QFileDialog, QListWidgetItem, QMessageBox, QProgressDialog, QProgressBar, QPushButton, QListWidget
 from PyQt5.QtGui import QIcon
 from PyQt5 import uic
-import scipy.io
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import logging
 import os
+import time
 
 
 
 # -- CUSTOM --------------------- # 
+from config.defaults import IMPORT_PARALLEL, IMPORT_MAX_WORKERS, IMPORT_CACHE, IMPORT_SHARED_MEMORY
+from loaders.import_cache import default_cache, prepare_trial
+from loaders.registry import file_filter, load_trial
 from utilities.path_utils import resource_path 
+from utilities import metrics
+from utilities.shared_arrays import SharedArrayTransport, shared_call
 from utilities.path_utils import base_path
 
 # ---------------- Worker that runs in a background thread ----------------
 class ImportWorker(QObject):
     progress = pyqtSignal(int, int, str)     # current, total, filename
-    fileImported = pyqtSignal(dict)          # emits each parsed {path, data, labels}
-    finished = pyqtSignal(list)              # emits final list
+    fileImported = pyqtSignal(dict)          # emits each parsed {path, data, labels} as soon as it is ready
+    finished = pyqtSignal(list)              # emits final list (empty unless keep_results)
     error = pyqtSignal(str)
     cancelled = pyqtSignal()
 
-    def __init__(self, paths):
+    def __init__(self, paths, parallel=False, max_workers=None, use_cache=False,
+                 keep_results=True, shared_memory=False):
         super().__init__()
         self._paths = list(paths)
+        self._keep = keep_results
         self._cancel = False
+        self._parallel = parallel
+        self._max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self._cache = None
+        if use_cache:
+            try:
+                self._cache = default_cache()
+            except OSError as e:
+                # read-only or full disk: import without the sidecar cache
+                logging.warning("Import cache unavailable, importing without it: %s", e)
+        self._shared = shared_memory
 
     @pyqtSlot()
     def run(self):
+        with metrics.span("import.batch"):
+            if self._parallel and len(self._paths) > 1 and self._max_workers > 1:
+                self._run_parallel()
+            else:
+                self._run_sequential()
+
+    def _run_sequential(self):
         results = []
         total = len(self._paths)
         for i, path in enumerate(self._paths):
@@ -36,35 +62,114 @@ class ImportWorker(QObject):
             try:
                 self.progress.emit(i, total, os.path.basename(path))
                 # --- heavy work here (off GUI thread) ---
-                mat = scipy.io.loadmat(path, struct_as_record=False, squeeze_me=True)
-                key = next((k for k in mat.keys() if not k.startswith("__")), None)
-                if key:
-                    tl = mat[key]
-                    results.append({
-                        "path": path,
-                        "data": tl.Analog.Data,
-                        "labels": tl.Analog.Labels
-                    })
+                with metrics.span("import.file"):
+                    trial = self._cache.load(path) if self._cache else load_trial(path)
+                if trial:
+                    self.fileImported.emit(trial)
+                    if self._keep:
+                        results.append(trial)
             except Exception as e:
                 self.error.emit(f"{os.path.basename(path)}: {e}")
                 # keep going to next file
         self.finished.emit(results)
 
+    def _run_parallel(self):
+        """
+        Parse files in a process pool, at most max_workers at a time.
+
+        Progress and fileImported are reported as files complete; the
+        final list (if kept) is in input order.
+        With the import cache, hits are memory-mapped here without a pool
+        job, and workers write sidecars instead of pickling matrices back.
+        With shared_memory, matrices that still come back from workers do
+        so through utilities.shared_arrays blocks owned by this process;
+        the emitted trials' arrays are views of those blocks.
+        """
+        total = len(self._paths)
+        results = [None] * total if self._keep else []
+        todo = iter(enumerate(self._paths))
+        pending = {}
+        started = {}
+        done = 0
+        job = prepare_trial if self._cache else load_trial
+        pool = ProcessPoolExecutor(max_workers=self._max_workers)
+        transport = SharedArrayTransport() if self._shared else None
+
+        def complete(i, get_trial):
+            nonlocal done
+            name = os.path.basename(self._paths[i])
+            if i in started:
+                # submit -> result, as seen from here
+                metrics.record("import.file", time.perf_counter() - started.pop(i))
+            self.progress.emit(done, total, name)
+            done += 1
+            try:
+                trial = get_trial()
+                if transport is not None:
+                    trial = transport.attach(trial)
+                if trial and trial.get("sidecar"):
+                    trial = self._cache.get(trial["path"])
+                    if trial is None:
+                        raise RuntimeError("import cache entry vanished")
+                elif trial and trial.get("reload"):
+                    trial = load_trial(trial["path"])
+                if trial:
+                    self.fileImported.emit(trial)
+                    if self._keep:
+                        results[i] = trial
+            except Exception as e:
+                self.error.emit(f"{name}: {e}")
+
+        def submit_next():
+            # refill one slot so only max_workers files are in memory
+            for i, path in todo:
+                if self._cancel:
+                    return
+                if metrics.enabled():
+                    started[i] = time.perf_counter()
+                hit = self._cache.get(path) if self._cache else None
+                if hit is not None:
+                    complete(i, lambda: hit)
+                    continue
+                if transport is not None:
+                    pending[pool.submit(shared_call, transport.address, job, path)] = i
+                else:
+                    pending[pool.submit(job, path)] = i
+                return
+
+        try:
+            for _ in range(self._max_workers):
+                submit_next()
+            while pending and not self._cancel:
+                finished, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    complete(pending.pop(fut), fut.result)
+                    submit_next()
+        finally:
+            pool.shutdown(wait=not self._cancel, cancel_futures=True)
+            if transport is not None:
+                # blocks of files finished but never collected (cancel)
+                transport.close()
+        self.finished.emit([r for r in results if r])
+
     @pyqtSlot()
     def cancel(self):
         self._cancel = True
 
 # ---------------- Your dialog class ----------------
 class LoadMat(QDialog):
-    matsImported = pyqtSignal(list)
+    matsImported = pyqtSignal(list)      # every trial at the end (only with keep_results)
+    trialImported = pyqtSignal(dict)     # each trial as soon as it is parsed
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, keep_results=True):
         super().__init__(parent) 
+        self._keep_results = keep_results
+        self._imported = 0
         ui_path = os.path.join(base_path("uis", "loadMat.ui")) 
         uic.loadUi(ui_path, self)       
         self.setWindowIcon(QIcon(resource_path('icons', 'icn_matlab.png')))
         self.paths = []
-        self.btnSelectFiles.clicked.connect(lambda: self.select_files("*.mat"))
+        self.btnSelectFiles.clicked.connect(lambda: self.select_files(file_filter()))
         self.btnImport.clicked.connect(self.on_import_clicked)
         self.btnClose.clicked.connect(self.close_dialog)
 
@@ -73,8 +178,8 @@ class LoadMat(QDialog):
         self._worker = None
         self._progress = None
 
-    def select_files(self, file_extension):
-        files, _ = QFileDialog.getOpenFileNames(self, "Open", "", file_extension)
+    def select_files(self, file_filter):
+        files, _ = QFileDialog.getOpenFileNames(self, "Open", "", file_filter)
         if files:
             self.paths = files
             self.listFiles.clear()
@@ -90,7 +195,7 @@ class LoadMat(QDialog):
     
     def _ensure_progress_dialog(self, total):
         # Make sure the dialog paints immediately and shows a proper bar at 0%
-        dlg = QProgressDialog("Importing MAT files...", "Cancel", 0, total, self)
+        dlg = QProgressDialog("Importing files...", "Cancel", 0, total, self)
         dlg.setWindowTitle("Import")
         dlg.setWindowModality(Qt.WindowModal)
         dlg.setAutoClose(False)     # we’ll close explicitly on finish
@@ -127,7 +232,7 @@ class LoadMat(QDialog):
     @pyqtSlot()
     def on_import_clicked(self):
         if not self.paths:
-            QMessageBox.warning(self, "No files", "Please select MAT files first.")
+            QMessageBox.warning(self, "No files", "Please select files first.")
             return
 
         # 1) Build progress dialog up-front (no blank UI)
@@ -135,13 +240,18 @@ class LoadMat(QDialog):
 
         # 2) Spin up worker thread
         self._thread = QThread(self)
-        self._worker = ImportWorker(self.paths)
+        self._worker = ImportWorker(self.paths, parallel=IMPORT_PARALLEL,
+                                    max_workers=IMPORT_MAX_WORKERS,
+                                    use_cache=IMPORT_CACHE,
+                                    keep_results=self._keep_results,
+                                    shared_memory=IMPORT_SHARED_MEMORY)
+        self._imported = 0
         self._worker.moveToThread(self._thread)
 
         # 3) Wire signals
         self._thread.started.connect(self._worker.run)
         self._worker.progress.connect(self._on_worker_progress)
-        self._worker.fileImported.connect(lambda _: None)  # optional per-file hook
+        self._worker.fileImported.connect(self._on_file_imported)
         self._worker.error.connect(self._on_worker_error)
         self._worker.finished.connect(self._on_worker_finished)
 
@@ -166,6 +276,12 @@ class LoadMat(QDialog):
         self._progress.setValue(i)  # shows 0,1,2,... BEFORE file is appended
         QCoreApplication.processEvents()
 
+    @pyqtSlot(dict)
+    def _on_file_imported(self, trial):
+        # forward right away so plots can appear before the batch is done
+        self._imported += 1
+        self.trialImported.emit(trial)
+
     @pyqtSlot(str)
     def _on_worker_error(self, msg):
         # Non-blocking toast-ish message; avoid modal stalls during long runs
@@ -181,10 +297,11 @@ class LoadMat(QDialog):
             self._progress = None
 
         # Emit to main window → plot tabs
-        if results:
-            self.matsImported.emit(results)
+        if self._imported:
+            if self._keep_results:
+                self.matsImported.emit(results)
             # This message pops instantly now (GUI thread is free)
-            QMessageBox.information(self, "Import complete", f"Imported {len(results)} file(s) successfully.")
+            QMessageBox.information(self, "Import complete", f"Imported {self._imported} file(s) successfully.")
             self.accept()
         else:
             QMessageBox.information(self, "Import", "No files were imported.")
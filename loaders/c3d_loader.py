@@ -0,0 +1,123 @@
+# /loaders/c3d_loader.py
+"""
+Minimal C3D reader for the analog channels.
+
+Only what an EMG import needs is decoded: the header, the ANALOG and
+POINT parameter groups, and the analog samples. Marker coordinates are
+skipped. Intel (little-endian), MIPS (big-endian) and DEC files with
+integer data are supported; DEC floating-point files raise ValueError.
+
+Each 3D frame stores the marker block followed by ``samples per frame``
+analog samples of every channel. The data section is memory-mapped as
+one record per frame. When the file holds no markers and needs no
+scaling, the (channels x samples) data is a view of that mapping;
+otherwise the analog block is scaled into one float64 copy,
+real = (raw - OFFSET) * SCALE * GEN_SCALE.
+"""
+
+import struct
+
+import numpy as np
+
+from loaders.trial import make_trial
+
+BLOCK = 512
+_PROCESSORS = {84: "<", 85: "<", 86: ">"}   # Intel, DEC, MIPS
+
+
+def is_c3d(path):
+    with open(path, "rb") as f:
+        head = f.read(2)
+    return len(head) == 2 and head[1] == 0x50
+
+
+def _parameters(f, e):
+    """Parse the parameter section into {"GROUP:NAME": value}."""
+    raw = f.read(4)
+    nblocks = raw[2]
+    data = raw + f.read(nblocks * BLOCK - 4)
+    groups, params = {}, []
+    pos = 4
+    while pos + 2 <= len(data):
+        nlen, gid = struct.unpack_from("bb", data, pos)
+        nlen = abs(nlen)
+        if nlen == 0 or gid == 0:
+            break
+        name = data[pos + 2:pos + 2 + nlen].decode("latin1").upper()
+        body = pos + 2 + nlen
+        nxt, = struct.unpack_from(e + "h", data, body)
+        if gid < 0:
+            groups[-gid] = name
+        else:
+            params.append((gid, name, body + 2))
+        if nxt == 0:
+            break
+        pos = body + nxt
+
+    out = {}
+    for gid, name, p in params:
+        dtype, ndims = struct.unpack_from("bb", data, p)
+        dims = list(data[p + 2:p + 2 + ndims])
+        p += 2 + ndims
+        if dtype == -1:
+            width, count = (dims[0], int(np.prod(dims[1:]))) if dims else (1, 1)
+            text = data[p:p + width * count].decode("latin1")
+            value = [text[i * width:(i + 1) * width].strip() for i in range(count)]
+        else:
+            dt = {1: "i1", 2: e + "i2", 4: e + "f4"}[dtype]
+            count = int(np.prod(dims)) if dims else 1
+            value = np.frombuffer(data, dt, count, p).astype(float)
+        out[f"{groups.get(gid, gid)}:{name}"] = value
+    return out
+
+
+def _header(f):
+    f.seek(0)
+    hdr = f.read(BLOCK)
+    if len(hdr) < BLOCK or hdr[1] != 0x50:
+        raise ValueError("Not a C3D file")
+    return hdr
+
+
+def load_c3d_trial(path):
+    """Load the analog channels of a C3D file as a trial dict (None if there are none)."""
+    with open(path, "rb") as f:
+        hdr = _header(f)
+        f.seek((hdr[0] - 1) * BLOCK)
+        # processor type sits in the parameter header; peek before parsing
+        proc = f.read(4)[3]
+        e = _PROCESSORS.get(proc)
+        if e is None:
+            raise ValueError(f"Unknown C3D processor type {proc}")
+        f.seek((hdr[0] - 1) * BLOCK)
+        params = _parameters(f, e)
+
+    npoints, analog_per_frame, first, last = struct.unpack_from(e + "hHHH", hdr, 2)
+    scale, = struct.unpack_from(e + "f", hdr, 12)
+    data_start, spf = struct.unpack_from(e + "HH", hdr, 16)
+    frame_rate, = struct.unpack_from(e + "f", hdr, 20)
+
+    is_float = scale < 0
+    if is_float and proc == 85:
+        raise ValueError("DEC floating-point C3D files are not supported")
+    nframes = int(params.get("POINT:FRAMES", [last - first + 1])[0]) if last >= first else 0
+    used = int(params.get("ANALOG:USED", [analog_per_frame // max(spf, 1)])[0])
+    if not used or not spf or nframes <= 0:
+        return None
+
+    vtype = np.dtype(e + ("f4" if is_float else "i2"))
+    frame = np.dtype([("points", vtype, (npoints * 4,)), ("analog", vtype, (spf, used))])
+    mm = np.memmap(path, dtype=frame, mode="r", offset=(data_start - 1) * BLOCK, shape=(nframes,))
+    analog = mm["analog"]                        # (frames, spf, used) strided view
+
+    gen = float(params.get("ANALOG:GEN_SCALE", [1.0])[0])
+    ch_scale = np.resize(params.get("ANALOG:SCALE", np.ones(used)), used)
+    ch_offset = np.resize(params.get("ANALOG:OFFSET", np.zeros(used)), used)
+    if npoints == 0 and is_float and gen == 1.0 and np.all(ch_scale == 1) and np.all(ch_offset == 0):
+        data = analog.reshape(nframes * spf, used).T          # no copy
+    else:
+        data = (analog.reshape(nframes * spf, used).T - ch_offset[:, None]) * (ch_scale * gen)[:, None]
+
+    fs = params.get("ANALOG:RATE", [frame_rate * spf])[0]
+    labels = params.get("ANALOG:LABELS", [])
+    return make_trial(path, data, labels[:used], fs)
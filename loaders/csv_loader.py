@@ -0,0 +1,67 @@
+# /loaders/csv_loader.py
+"""
+Delimited text exports: one column per channel, one row per sample.
+
+An optional header row gives the channel labels. A leading time column
+(header "time", "t" or starting with "time ") is used for the sample rate
+and dropped from the channels. Text cannot be memory-mapped, so the file
+is parsed once into a (samples x channels) array and the trial's data is
+its transposed view, not a second copy.
+"""
+
+import csv
+
+import numpy as np
+
+from loaders.trial import make_trial
+
+SNIFF_BYTES = 64 * 1024
+TIME_HEADERS = ("time", "t")
+
+
+def _dialect(path):
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        head = f.read(SNIFF_BYTES)
+    try:
+        delimiter = csv.Sniffer().sniff(head, delimiters=",;\t ").delimiter
+    except csv.Error:
+        delimiter = ","
+    first = head.splitlines()[0] if head else ""
+    cells = [c.strip().strip('"') for c in first.split(delimiter)]
+    return delimiter, cells, _is_header(cells)
+
+
+def _is_header(cells):
+    for c in cells:
+        try:
+            float(c)
+        except ValueError:
+            if c:
+                return True
+    return False
+
+
+def _is_time(label):
+    label = label.lower()
+    return label in TIME_HEADERS or label.startswith("time ") or label.startswith("time(")
+
+
+def load_csv_trial(path):
+    """Load a CSV/TSV export. Returns a trial dict, or None for an empty file."""
+    delimiter, cells, header = _dialect(path)
+    if not cells or cells == [""]:
+        return None
+    table = np.loadtxt(path, delimiter=None if delimiter == " " else delimiter,
+                       skiprows=1 if header else 0, ndmin=2, encoding="utf-8-sig")
+    labels = cells if header else []
+    fs = None
+    if header and _is_time(cells[0]) and table.shape[1] > 1:
+        t = table[:, 0]
+        if t.size > 1:
+            dt = np.median(np.diff(t))
+            fs = 1.0 / dt if dt > 0 else None
+        # "ms" in the header: the time column is in milliseconds
+        if fs and "ms" in cells[0].lower():
+            fs *= 1000.0
+        table, labels = table[:, 1:], labels[1:]
+    return make_trial(path, table.T, labels, fs)
@@ -0,0 +1,139 @@
+# /loaders/import_cache.py
+"""
+Binary sidecar cache for imported files.
+
+On first import the analog matrix is written as a raw .npy next to a small
+meta.json (labels, sample rate, source path, size, mtime and SHA-256).
+Later imports memory-map the .npy and skip parsing entirely. An entry
+is stale when the source size changes, or when its mtime changes and the
+content hash no longer matches; stale entries are rebuilt. The cache is
+size-bounded with least-recently-used eviction (utilities.disk_cache).
+
+Trials whose data is already on disk (HDF5 MAT v7.3, memory-mapped raw
+binary and C3D) are not cached.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from config.defaults import IMPORT_CACHE_BYTES
+from loaders.registry import load_trial
+from utilities.disk_cache import DiskLRU, file_digest
+from utilities.path_utils import user_data_path
+
+SIDECAR_VERSION = 1
+
+
+class ImportCache:
+    def __init__(self, root=None, max_bytes=IMPORT_CACHE_BYTES):
+        root = root or user_data_path("cache", "imports", create=True)
+        self.store = DiskLRU(root, max_bytes)
+
+    @staticmethod
+    def key(path):
+        return hashlib.sha256(os.path.realpath(path).encode("utf-8")).hexdigest()
+
+    def get(self, path):
+        """Return the cached trial for ``path`` (data memory-mapped), or None."""
+        key = self.key(path)
+        entry = self.store.get(key)
+        if entry is None:
+            return None
+        try:
+            meta = json.loads((entry / "meta.json").read_text(encoding="utf-8"))
+            if not self._fresh(path, meta, entry):
+                self.store.discard(key)
+                return None
+            data = np.load(entry / "data.npy", mmap_mode="r")
+        except (OSError, ValueError, KeyError):
+            self.store.discard(key)
+            return None
+        return {"path": path, "data": data, "labels": meta["labels"], "fs": meta["fs"]}
+
+    def put(self, trial):
+        """Write the sidecar for a freshly loaded trial; return False if not cacheable."""
+        data = trial.get("data")
+        if not isinstance(data, np.ndarray) or _is_mapped(data):
+            return False
+        path = trial["path"]
+        st = os.stat(path)
+        meta = {
+            "version": SIDECAR_VERSION,
+            "source": os.path.realpath(path),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": file_digest(path),
+            "labels": list(trial.get("labels") or []),
+            "fs": trial.get("fs"),
+            "shape": list(trial["data"].shape),
+            "dtype": trial["data"].dtype.str,
+        }
+        tmp = self.store.new_entry()
+        np.save(tmp / "data.npy", np.ascontiguousarray(trial["data"]))
+        (tmp / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+        self.store.commit(self.key(path), tmp)
+        return True
+
+    def load(self, path):
+        """Cached trial if fresh, otherwise load the file and cache it."""
+        trial = self.get(path)
+        if trial is None:
+            trial = load_trial(path)
+            if trial:
+                self.put(trial)
+        return trial
+
+    def _fresh(self, path, meta, entry):
+        st = os.stat(path)
+        if meta.get("version") != SIDECAR_VERSION or meta["size"] != st.st_size:
+            return False
+        if meta["mtime_ns"] == st.st_mtime_ns:
+            return True
+        # touched or copied over: reuse if the content is unchanged
+        if file_digest(path) != meta["sha256"]:
+            return False
+        meta["mtime_ns"] = st.st_mtime_ns
+        (entry / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+        return True
+
+
+def _is_mapped(a):
+    """True if ``a`` is (a view of) a memory-mapped file."""
+    while isinstance(a, np.ndarray):
+        if isinstance(a, np.memmap):
+            return True
+        a = a.base
+    return False
+
+
+_default_cache = None
+
+
+def default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ImportCache()
+    return _default_cache
+
+
+def prepare_trial(path):
+    """
+    Process-pool job: make sure ``path`` has a sidecar.
+
+    Returns {"path", "sidecar": True} when the trial can be memory-mapped
+    from the cache by the caller (so the matrix is never pickled back),
+    {"path", "reload": True} when the file maps itself and is cheap to
+    open again in the caller, or the loaded trial itself otherwise.
+    """
+    cache = default_cache()
+    if cache.get(path) is not None:
+        return {"path": path, "sidecar": True}
+    trial = load_trial(path)
+    if trial and cache.put(trial):
+        return {"path": path, "sidecar": True}
+    if trial and _is_mapped(trial["data"]):
+        return {"path": path, "reload": True}
+    return trial
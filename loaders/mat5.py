@@ -0,0 +1,288 @@
+# /loaders/mat5.py
+"""
+Selective reader for MATLAB v5/v6/v7 MAT files.
+
+scipy.io.loadmat decodes every field of a struct before the caller can
+pick one. QTM exports keep video, force-plate and marker payloads next to
+the analog block in the same struct, so most of the parse is thrown away.
+This reader walks the element stream and only materializes the fields
+named in ``select``; every other element is skipped by its byte count
+(seeked over in uncompressed files, streamed through zlib in bounded
+chunks and discarded in compressed ones).
+
+Supported: numeric, logical, char, cell, struct and object arrays.
+Anything else that is *selected* raises UnsupportedMatFile so the caller
+can fall back to scipy.io.loadmat; unselected elements of any type are
+skipped. MAT v7.3 files are HDF5 and are not handled here.
+"""
+
+import struct
+import zlib
+
+import numpy as np
+
+
+class UnsupportedMatFile(ValueError):
+    """The file (or a selected element) is outside what this reader decodes."""
+
+
+# --- Element (mi*) and array class (mx*) codes ----------------------------
+miINT8, miUINT8, miINT16, miUINT16, miINT32, miUINT32 = 1, 2, 3, 4, 5, 6
+miSINGLE, miDOUBLE, miINT64, miUINT64 = 7, 9, 12, 13
+miMATRIX, miCOMPRESSED, miUTF8, miUTF16, miUTF32 = 14, 15, 16, 17, 18
+
+mxCELL, mxSTRUCT, mxOBJECT, mxCHAR, mxSPARSE = 1, 2, 3, 4, 5
+
+_MI_DTYPES = {miINT8: "i1", miUINT8: "u1", miINT16: "i2", miUINT16: "u2",
+              miINT32: "i4", miUINT32: "u4", miSINGLE: "f4", miDOUBLE: "f8",
+              miINT64: "i8", miUINT64: "u8", miUTF8: "u1", miUTF16: "u2", miUTF32: "u4"}
+_MX_DTYPES = {6: "f8", 7: "f4", 8: "i1", 9: "u1", 10: "i2", 11: "u2",
+              12: "i4", 13: "u4", 14: "i8", 15: "u8"}
+
+_LOGICAL = 0x0200
+_COMPLEX = 0x0800
+
+READ_CHUNK = 1 << 16       # compressed bytes read from disk per step
+INFLATE_CHUNK = 1 << 18    # max decompressed bytes held at once
+
+
+# --------------------------------------------------------------------------
+# Byte streams over a region of the file
+# --------------------------------------------------------------------------
+class _FileRegion:
+    """Uncompressed element data: reads come straight from the file, skips seek."""
+
+    def __init__(self, f):
+        self._f = f
+
+    def readinto(self, mv):
+        if self._f.readinto(mv) != len(mv):
+            raise EOFError("Unexpected end of MAT file")
+
+    def read(self, n):
+        data = self._f.read(n)
+        if len(data) != n:
+            raise EOFError("Unexpected end of MAT file")
+        return data
+
+    def skip(self, n):
+        self._f.seek(n, 1)
+
+
+class _ZlibRegion:
+    """miCOMPRESSED element data, inflated on demand in bounded chunks."""
+
+    def __init__(self, f, size):
+        self._f = f
+        self._left = size
+        self._inflate = zlib.decompressobj()
+        self._pending = b""
+        self._pos = 0
+
+    def _fill(self):
+        while True:
+            if self._inflate.unconsumed_tail:
+                data = self._inflate.unconsumed_tail
+            elif self._left > 0:
+                data = self._f.read(min(READ_CHUNK, self._left))
+                if not data:
+                    break
+                self._left -= len(data)
+            else:
+                break
+            out = self._inflate.decompress(data, INFLATE_CHUNK)
+            if out:
+                self._pending, self._pos = out, 0
+                return
+        raise EOFError("Unexpected end of compressed MAT element")
+
+    def readinto(self, mv):
+        got, n = 0, len(mv)
+        while got < n:
+            if self._pos >= len(self._pending):
+                self._fill()
+            take = min(n - got, len(self._pending) - self._pos)
+            mv[got:got + take] = memoryview(self._pending)[self._pos:self._pos + take]
+            got += take
+            self._pos += take
+
+    def read(self, n):
+        buf = bytearray(n)
+        self.readinto(memoryview(buf))
+        return bytes(buf)
+
+    def skip(self, n):
+        while n > 0:
+            if self._pos >= len(self._pending):
+                self._fill()
+            take = min(n, len(self._pending) - self._pos)
+            self._pos += take
+            n -= take
+
+
+# --------------------------------------------------------------------------
+# Element parsing
+# --------------------------------------------------------------------------
+class _Reader:
+    def __init__(self, endian):
+        self.e = endian
+
+    def tag(self, s):
+        """Return (type, nbytes, small_data); small_data is set for packed elements."""
+        raw = s.read(8)
+        w0, w1 = struct.unpack(self.e + "II", raw)
+        if w0 >> 16:
+            nbytes = w0 >> 16
+            return w0 & 0xFFFF, nbytes, raw[4:4 + nbytes]
+        return w0, w1, None
+
+    def data(self, s, mtype, nbytes, small):
+        """Read an element's payload as a 1-D array of its storage dtype."""
+        dt = np.dtype(self.e + _MI_DTYPES[mtype])
+        if small is not None:
+            return np.frombuffer(small, dt).copy()
+        arr = np.empty(nbytes // dt.itemsize, dt)
+        s.readinto(memoryview(arr).cast("B"))
+        s.skip(-nbytes % 8)
+        return arr
+
+    def element(self, s):
+        mtype, nbytes, small = self.tag(s)
+        if mtype not in _MI_DTYPES:
+            raise UnsupportedMatFile(f"Unexpected element type {mtype}")
+        return self.data(s, mtype, nbytes, small)
+
+    def skip_matrix(self, s):
+        mtype, nbytes, small = self.tag(s)
+        if small is None:
+            s.skip(nbytes + (-nbytes % 8))
+
+    def matrix(self, s, select=True):
+        """Parse one miMATRIX element, decoding only what ``select`` asks for."""
+        mtype, nbytes, small = self.tag(s)
+        if mtype != miMATRIX:
+            raise UnsupportedMatFile(f"Expected miMATRIX, found element type {mtype}")
+        if nbytes == 0:
+            return np.empty((0, 0))
+        return self._matrix_body(s, select)
+
+    def _matrix_body(self, s, select, flags=None, dims=None):
+        """Decode a matrix; ``flags``/``dims`` are passed when the header was already read."""
+        if flags is None:
+            flags = self.element(s)
+            dims = self.element(s)
+            self.element(s)  # array name (empty inside structs and cells)
+        cls, bits = int(flags[0]) & 0xFF, int(flags[0])
+        dims = tuple(int(d) for d in dims)
+        count = int(np.prod(dims))
+
+        if cls in _MX_DTYPES:
+            return self._numeric(s, cls, bits, dims)
+        if cls == mxCHAR:
+            return _chars(self.element(s), dims)
+        if cls == mxCELL:
+            return [self.matrix(s, select) for _ in range(count)]
+        if cls in (mxSTRUCT, mxOBJECT):
+            if cls == mxOBJECT:
+                self.element(s)  # class name
+            namelen = int(self.element(s)[0])
+            raw = self.element(s).tobytes()
+            names = [raw[i:i + namelen].split(b"\0", 1)[0].decode("latin1")
+                     for i in range(0, len(raw), namelen)] if namelen else []
+            records = []
+            for _ in range(count):
+                rec = {}
+                for name in names:
+                    if select is True or name in select:
+                        sub = True if select is True else select[name]
+                        rec[name] = self.matrix(s, sub)
+                    else:
+                        self.skip_matrix(s)
+                records.append(rec)
+            return records[0] if count == 1 else records
+        raise UnsupportedMatFile(f"Array class {cls} is not supported")
+
+    def _numeric(self, s, cls, bits, dims):
+        mtype, nbytes, small = self.tag(s)
+        real = self.data(s, mtype, nbytes, small)
+        if bits & _COMPLEX:
+            imag = self.element(s)
+            real = real + 1j * imag
+        target = np.dtype(_MX_DTYPES[cls]) if not bits & _COMPLEX else real.dtype.newbyteorder("=")
+        if bits & _LOGICAL:
+            target = np.dtype(bool)
+        # Column-major on disk -> C-contiguous in memory, cast and byte-swapped in one copy
+        return np.ascontiguousarray(real.reshape(dims[::-1]).transpose(), dtype=target)
+
+
+def _chars(codes, dims):
+    if codes.dtype.itemsize == 1:
+        text = codes.tobytes().decode("utf-8", errors="replace")
+    else:
+        text = "".join(map(chr, codes.tolist()))
+    if len(dims) != 2 or dims[0] <= 1:
+        return text
+    rows, cols = dims
+    # column-major char matrix -> one string per row
+    return ["".join(text[c * rows + r] for c in range(cols)) for r in range(rows)]
+
+
+# --------------------------------------------------------------------------
+# Public API
+# --------------------------------------------------------------------------
+def read_variable(path, select=True, name=None):
+    """
+    Decode one top-level variable of a MAT v5 file.
+
+    Parameters
+    ----------
+    path : str MAT file.
+    select : True or dict Fields to decode. True decodes everything; a dict
+        maps struct field names to nested selections, e.g.
+        {"Analog": {"Data": True, "Labels": True}}. Unlisted fields are
+        skipped without being parsed.
+    name : str Variable to read. Default: the first one in the file.
+
+    Returns
+    -------
+    (name, value) where structs are dicts (lists of dicts for struct
+    arrays), cells are lists, char arrays are str and numeric arrays are
+    C-contiguous ndarrays in MATLAB's (unsqueezed) shape. (None, None) if
+    the file holds no matching variable.
+    """
+    with open(path, "rb") as f:
+        header = f.read(128)
+        if len(header) < 128 or header[124:126] not in (b"\x00\x01", b"\x01\x00"):
+            raise UnsupportedMatFile("Not a MAT v5 file")
+        endian = {b"IM": "<", b"MI": ">"}.get(header[126:128])
+        if endian is None:
+            raise UnsupportedMatFile("Bad MAT endian indicator")
+        if header.startswith(b"MATLAB 7.3"):
+            raise UnsupportedMatFile("MAT v7.3 (HDF5) file")
+        reader = _Reader(endian)
+
+        while True:
+            raw = f.read(8)
+            if len(raw) < 8:
+                return None, None
+            top, nbytes = struct.unpack(endian + "II", raw)
+            start = f.tell()
+            end = start + nbytes
+            if top == miCOMPRESSED:
+                s = _ZlibRegion(f, nbytes)
+                mtype, inner, _ = reader.tag(s)
+            elif top == miMATRIX:
+                s, mtype, inner = _FileRegion(f), miMATRIX, nbytes
+                end += -nbytes % 8
+            else:
+                mtype, inner = top, 0
+
+            if mtype == miMATRIX and inner:
+                # read the variable name before committing to a decode
+                flags = reader.element(s)
+                dims = reader.element(s)
+                var = reader.element(s).tobytes().decode("latin1")
+                if not var.startswith("__") and (name is None or var == name):
+                    return var, reader._matrix_body(s, select, flags, dims)
+            f.seek(end)
+
@@ -0,0 +1,143 @@
+# /loaders/mat73.py
+"""
+MAT v7.3 (HDF5) loading with lazy, chunk-backed channel access.
+
+scipy.io.loadmat cannot read v7.3 files. Here the HDF5 container is
+opened with h5py (optional dependency, imported on first use) and
+``Analog.Data`` is exposed as an H5AnalogData: a (channels x samples)
+array-like that only reads the channels and time ranges it is indexed
+with. Labels and the sample rate are small and read eagerly.
+
+MATLAB stores arrays transposed in HDF5, so a (channels x samples)
+matrix is a (samples x channels) dataset on disk.
+"""
+
+import numpy as np
+
+from loaders.trial import make_trial
+
+HDF5_SIGNATURE = b"\x89HDF\r\n\x1a\n"
+
+# HDF5 chunk cache per open file; repeated channel reads hit memory
+CHUNK_CACHE_BYTES = 32 * 2**20
+
+
+def _h5py():
+    try:
+        import h5py
+    except ImportError as e:
+        raise ImportError("Reading MAT v7.3 files requires the h5py package") from e
+    return h5py
+
+
+def is_mat73(path):
+    """True if ``path`` is an HDF5-based MAT file (user block + HDF5 signature)."""
+    with open(path, "rb") as f:
+        head = f.read(520)
+    return head.startswith(b"MATLAB 7.3") or head[512:520] == HDF5_SIGNATURE \
+        or head[:8] == HDF5_SIGNATURE
+
+
+class H5AnalogData:
+    """
+    (channels x samples) view of a MAT v7.3 dataset.
+
+    Indexing reads from disk: ``data[3]`` reads one channel,
+    ``data[:, 1000:2000]`` one time range of every channel, and
+    ``np.asarray(data)`` everything. Pickles as (path, dataset name) and
+    reopens the file on first use, so it can cross process boundaries.
+    """
+
+    def __init__(self, path, name):
+        self.path = path
+        self.name = name
+        self._file = None
+        ds = self._dataset()
+        self.shape = tuple(reversed(ds.shape)) if ds.ndim == 2 else (1, ds.shape[0])
+        self.dtype = ds.dtype
+
+    ndim = 2
+
+    @property
+    def size(self):
+        return self.shape[0] * self.shape[1]
+
+    @property
+    def nbytes(self):
+        return self.size * self.dtype.itemsize
+
+    def __len__(self):
+        return self.shape[0]
+
+    def _dataset(self):
+        if self._file is None:
+            self._file = _h5py().File(self.path, "r", rdcc_nbytes=CHUNK_CACHE_BYTES)
+        return self._file[self.name]
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        ch, t = key + (slice(None),) * (2 - len(key))
+        ds = self._dataset()
+        if ds.ndim == 1:
+            return np.atleast_2d(ds[t])[ch]
+
+        if isinstance(ch, (list, tuple, np.ndarray)):
+            # h5py needs increasing indices; read sorted, then restore the order
+            ch = np.asarray(ch)
+            order = np.argsort(ch)
+            block = ds[t, ch[order].tolist()]
+            out = np.empty_like(block)
+            out[..., order] = block
+        else:
+            out = ds[t, ch]
+        return np.ascontiguousarray(np.transpose(out))
+
+    def __array__(self, dtype=None, copy=None):
+        out = self[:, :]
+        return out if dtype is None else out.astype(dtype, copy=False)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __getstate__(self):
+        return {"path": self.path, "name": self.name, "shape": self.shape, "dtype": self.dtype}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._file = None
+
+    def __repr__(self):
+        return f"H5AnalogData({self.path!r}, {self.name!r}, shape={self.shape})"
+
+
+def _read_string(f, obj):
+    codes = np.asarray(obj[()]).ravel()
+    return "".join(map(chr, codes.tolist())) if codes.size else ""
+
+
+def _read_labels(f, node):
+    if node.dtype.kind == "O":        # cell array: references to char datasets
+        return [_read_string(f, f[ref]) for ref in np.asarray(node[()]).ravel()]
+    return [_read_string(f, node)]    # a single char array
+
+
+def load_mat73_trial(path):
+    """
+    Open a QTM v7.3 export. Returns {"path", "data", "labels", "fs"} like
+    loaders.mat_loader.load_mat_trial, with ``data`` an H5AnalogData.
+    """
+    h5py = _h5py()
+    with h5py.File(path, "r") as f:
+        key = next((k for k in f.keys() if not k.startswith("#")), None)
+        if key is None:
+            return None
+        analog = f[key].get("Analog")
+        if not isinstance(analog, h5py.Group) or "Data" not in analog:
+            raise ValueError("No single Analog struct in file")
+        labels = _read_labels(f, analog["Labels"]) if "Labels" in analog else []
+        fs = float(np.asarray(analog["Frequency"][()]).ravel()[0]) if "Frequency" in analog else None
+        name = analog["Data"].name
+    return make_trial(path, H5AnalogData(path, name), labels, fs)
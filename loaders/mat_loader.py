@@ -0,0 +1,56 @@
+# /loaders/mat_loader.py
+"""
+Qt-free MAT file loading shared by the import dialog and worker processes.
+
+Only the analog block of a QTM export is decoded (loaders.mat5); video,
+force-plate and marker fields are skipped without being parsed. Files the
+selective reader does not handle fall back to scipy.io.loadmat restricted
+to the first variable. MAT v7.3 (HDF5) files go through loaders.mat73
+and keep their analog data on disk until it is indexed.
+"""
+
+import numpy as np
+
+from loaders import mat5, mat73
+from loaders.trial import make_trial
+
+ANALOG_FIELDS = {"Analog": {"Data": True, "Labels": True, "Frequency": True}}
+
+
+def load_mat_trial(path):
+    """
+    Load a QTM MAT export and keep only its analog block.
+
+    Returns {"path", "data", "labels", "fs"} or None when the file holds no
+    variable. ``data`` is a C-contiguous (channels x samples) array,
+    ``labels`` a list of str and ``fs`` the analog rate (None if absent).
+    For MAT v7.3 files ``data`` is a lazy loaders.mat73.H5AnalogData.
+    """
+    if mat73.is_mat73(path):
+        return mat73.load_mat73_trial(path)
+    try:
+        _, tl = mat5.read_variable(path, select=ANALOG_FIELDS)
+    except mat5.UnsupportedMatFile:
+        return _load_with_scipy(path)
+    if tl is None:
+        return None
+    analog = tl.get("Analog") if isinstance(tl, dict) else None
+    if not isinstance(analog, dict):
+        raise ValueError("No single Analog struct in file")
+    return _trial(path, analog.get("Data"), analog.get("Labels"), analog.get("Frequency"))
+
+
+def _load_with_scipy(path):
+    import scipy.io   # fallback only; slow to import
+    names = [name for name, _, _ in scipy.io.whosmat(path) if not name.startswith("__")]
+    if not names:
+        return None
+    mat = scipy.io.loadmat(path, variable_names=names[:1], struct_as_record=False, squeeze_me=True)
+    analog = mat[names[0]].Analog
+    trial = _trial(path, analog.Data, analog.Labels, getattr(analog, "Frequency", None))
+    del mat, analog  # drop the parsed struct before returning
+    return trial
+
+
+def _trial(path, data, labels, fs):
+    return make_trial(path, np.atleast_2d(np.ascontiguousarray(data)), labels, fs)
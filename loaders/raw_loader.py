@@ -0,0 +1,64 @@
+# /loaders/raw_loader.py
+"""
+Raw binary EMG exports described by a JSON sidecar.
+
+``rec.bin`` is read through ``rec.json`` (or ``rec.bin.json``):
+
+    {"channels": 8, "fs": 2000, "dtype": "<f4",
+     "layout": "interleaved", "offset": 0, "labels": ["EMG1", ...],
+     "scale": 1.0}
+
+layout "interleaved" stores samples x channels (one frame after another),
+"planar" channels x samples. The file is memory-mapped and the trial's
+data is a (channels x samples) view of the mapping (transposed for
+interleaved files), so nothing is read until it is indexed. A "scale"
+other than 1 cannot be applied lazily and costs one scaled copy.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from loaders.trial import make_trial
+
+EXTENSIONS = [".bin", ".raw", ".dat"]
+
+
+def sidecar_path(path):
+    """The JSON description of ``path``, or None if there is none."""
+    for candidate in (os.path.splitext(path)[0] + ".json", path + ".json"):
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def has_sidecar(path):
+    return sidecar_path(path) is not None
+
+
+def load_raw_trial(path):
+    side = sidecar_path(path)
+    if side is None:
+        raise ValueError(f"{os.path.basename(path)} has no JSON sidecar describing its layout")
+    with open(side, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+
+    channels = int(meta["channels"])
+    dtype = np.dtype(meta.get("dtype", "<f4"))
+    offset = int(meta.get("offset", 0))
+    layout = meta.get("layout", "interleaved")
+    if layout not in ("interleaved", "planar"):
+        raise ValueError(f"Unknown layout {layout!r} in {os.path.basename(side)}")
+
+    samples = (os.path.getsize(path) - offset) // (dtype.itemsize * channels)
+    if samples <= 0:
+        return None
+    shape = (samples, channels) if layout == "interleaved" else (channels, samples)
+    data = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+    if layout == "interleaved":
+        data = data.T
+    scale = meta.get("scale", 1.0)
+    if scale != 1.0:
+        data = data * np.asarray(scale, dtype=float).reshape(-1, 1)
+    return make_trial(path, data, meta.get("labels"), meta.get("fs"))
@@ -0,0 +1,93 @@
+# /loaders/registry.py
+"""
+Loader registry: maps files to the function that imports them.
+
+A loader is looked up by file extension first, then by asking each
+registered ``sniff(path)`` whether it recognizes the content (for
+extensions shared between formats, or none at all). Every loader returns
+a trial dict (loaders.trial.make_trial) or None when the file holds no
+data. New formats register themselves here; the import dialog builds its
+file filter from the registry and never needs to change.
+
+Example:
+    register("EDF", [".edf"], load_edf)
+    trial = load_trial(path)
+"""
+
+import os
+from collections import namedtuple
+
+Loader = namedtuple("Loader", "name extensions load sniff")
+
+_loaders = []
+
+
+def register(name, extensions, load, sniff=None):
+    """
+    Add a loader. A later registration for the same name replaces the
+    earlier one, so applications can override a built-in format.
+
+    name : str Shown in the file dialog filter.
+    extensions : list of str Lower-case, with the dot (".csv").
+    load : callable(path) -> trial dict or None. Must be picklable (module
+        level) so it can run in worker processes.
+    sniff : callable(path) -> bool Optional content check.
+    """
+    unregister(name)
+    _loaders.append(Loader(name, tuple(e.lower() for e in extensions), load, sniff))
+
+
+def unregister(name):
+    _loaders[:] = [l for l in _loaders if l.name != name]
+
+
+def loaders():
+    return list(_loaders)
+
+
+def extensions():
+    return sorted({e for l in _loaders for e in l.extensions})
+
+
+def loader_for(path):
+    """Return the Loader for ``path``; raise ValueError if none matches."""
+    ext = os.path.splitext(path)[1].lower()
+    candidates = [l for l in _loaders if ext in l.extensions]
+    # several formats on one extension: let the content decide
+    for l in candidates:
+        if len(candidates) == 1 or l.sniff is None or _sniff(l, path):
+            return l
+    for l in _loaders:
+        if l.sniff is not None and l not in candidates and _sniff(l, path):
+            return l
+    raise ValueError(f"No loader for {os.path.basename(path)}")
+
+
+def _sniff(loader, path):
+    try:
+        return bool(loader.sniff(path))
+    except (OSError, ValueError):
+        return False
+
+
+def load_trial(path):
+    """Import ``path`` with its registered loader."""
+    return loader_for(path).load(path)
+
+
+def file_filter():
+    """Qt file dialog filter listing every registered format."""
+    entries = [f"{l.name} ({' '.join('*' + e for e in l.extensions)})" for l in _loaders]
+    every = " ".join("*" + e for e in extensions())
+    return ";;".join([f"All supported ({every})"] + entries + ["All files (*)"])
+
+
+def _register_builtins():
+    from loaders import c3d_loader, csv_loader, mat_loader, raw_loader
+    register("MAT files", [".mat"], mat_loader.load_mat_trial)
+    register("C3D files", [".c3d"], c3d_loader.load_c3d_trial, c3d_loader.is_c3d)
+    register("CSV files", [".csv", ".txt"], csv_loader.load_csv_trial)
+    register("Raw binary", raw_loader.EXTENSIONS, raw_loader.load_raw_trial, raw_loader.has_sidecar)
+
+
+_register_builtins()
@@ -0,0 +1,30 @@
+# /loaders/trial.py
+"""
+The trial record every loader returns.
+
+A trial is a plain dict so it can travel through Qt signals
+(pyqtSignal(dict)) and process pools unchanged:
+
+    {"path": str, "data": (channels x samples) array, "labels": [str], "fs": float | None}
+
+``data`` is handed over as the loader produced it: a NumPy view of the
+parsed buffer, an np.memmap over the file, or a lazy array-like such as
+loaders.mat73.H5AnalogData. make_trial never copies it.
+"""
+
+import numpy as np
+
+
+def make_trial(path, data, labels=None, fs=None):
+    """Normalize loader output into a trial dict without copying ``data``."""
+    if getattr(data, "ndim", 2) < 2:
+        data = np.atleast_2d(data)          # a view for ndarrays
+    if isinstance(labels, str):
+        labels = [labels]
+    elif labels is None:
+        labels = []
+    labels = [str(l).strip() for l in np.ravel(np.asarray(labels, dtype=object))]
+    n = data.shape[0]
+    labels = labels[:n] + [f"channel {c + 1}" for c in range(len(labels), n)]
+    fs = float(np.asarray(fs).ravel()[0]) if fs is not None and np.size(fs) else None
+    return {"path": path, "data": data, "labels": labels, "fs": fs}
@@ -5,13 +5,16 @@ Minimal PyQt5 Application Template that uses ui_initializer
 - Dynamic version banner (from config.defaults)
 """
 
-import os, sys, time, logging
+import os, sys, time, logging, multiprocessing
 from logging.handlers import RotatingFileHandler
 from PyQt5 import QtCore, QtGui, QtWidgets
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPixmap, QFont, QIcon
 from PyQt5.QtWidgets import QSplashScreen, QMainWindow, QMessageBox, QAction
-from utilities.path_utils import base_path, resource_path
+from utilities import metrics, profiling
+from utilities.log_queue import LogPipeline
+from utilities.path_utils import base_path, resource_path, user_data_path
+from config.defaults import LOG_QUEUE_SIZE, LOG_QUEUE_OVERFLOW, METRICS_ENABLED
 
 # --------------------------------------------------------------------------
 # Version info (import from config)
@@ -23,51 +26,74 @@ except ImportError:
     BUILDNUMBER = "25.11-alpha.01"
 
 # --------------------------------------------------------------------------
-# Startup banner
+# Paths (frozen-safe)
 # --------------------------------------------------------------------------
-print(f"{FRIENDLYVERSIONNAME} {BUILDNUMBER} Portable version.")
-print("Installing font cache — please wait...")
-print("-" * 60)
-sys.stdout.flush()
-
-# --------------------------------------------------------------------------
-# Logging (frozen-safe)
-# --------------------------------------------------------------------------
-if getattr(sys, "frozen", False):   
-    LOG_DIR = os.path.join(os.environ.get("APPDATA", os.getcwd()), FRIENDLYVERSIONNAME.replace(" ", ""), "logs")
-else:
-    LOG_DIR = os.path.join(os.path.dirname(__file__), "logs")
-os.makedirs(LOG_DIR, exist_ok=True)
+LOG_DIR = user_data_path("logs")     # %APPDATA%/<name>/logs when frozen
 LOGFILE = os.path.join(LOG_DIR, "app.log")
 
-handler = RotatingFileHandler(LOGFILE, maxBytes=1_000_000, backupCount=3)
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[handler, logging.StreamHandler(sys.stdout)]
-)
-logging.info("Logger initialized at %s", LOGFILE)
+LOG_PIPELINE = None
+
 
 # --------------------------------------------------------------------------
-# ui_initializer import
+# Session setup — main process only. Import workers (ProcessPoolExecutor,
+# spawn on Windows / frozen builds) re-import this module, so nothing here
+# may run at import time.
 # --------------------------------------------------------------------------
-import ui_initializer as gui
+def init_session(argv=()):
+    """Banner, logging pipeline, profiling and metrics. Safe to call twice."""
+    global LOG_PIPELINE
+    if LOG_PIPELINE is not None:
+        return LOG_PIPELINE
+
+    print(f"{FRIENDLYVERSIONNAME} {BUILDNUMBER} Portable version.")
+    print("Installing font cache — please wait...")
+    print("-" * 60)
+    sys.stdout.flush()
+
+    # One background thread owns every sink (file, console, Qt widget);
+    # callers only enqueue. See utilities/log_queue.py.
+    os.makedirs(LOG_DIR, exist_ok=True)
+    handler = RotatingFileHandler(LOGFILE, maxBytes=1_000_000, backupCount=3)
+    LOG_PIPELINE = LogPipeline(
+        [handler, logging.StreamHandler(sys.stdout)],
+        maxsize=LOG_QUEUE_SIZE,
+        overflow=LOG_QUEUE_OVERFLOW,
+        formatter=logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"),
+    ).install(level=logging.INFO)
+    logging.info("Logger initialized at %s", LOGFILE)
+
+    # Session profiling (utilities/profiling.py): --profile or Help > Profile Session
+    profiling.configure(LOG_DIR)
+    if "--profile" in argv:
+        profiling.start()
+
+    # Timing spans (utilities/metrics.py); near-free while disabled
+    metrics.enable(METRICS_ENABLED or "--metrics" in argv)
+    return LOG_PIPELINE
 
 
 class ApplicationWindow(QMainWindow):
     def __init__(self):
         super().__init__()
+        # ui_initializer (uic, menus, docks) loads with the first window, so
+        # the splash is up before it is imported. Heavy scientific and
+        # dialog modules load on first use; see benchmarks/import_time.py.
+        with metrics.span("startup.import_ui"):
+            import ui_initializer as gui
+
         self.setWindowTitle(FRIENDLYVERSIONNAME)
         self.setWindowIcon(QIcon(base_path("resources/icons", "icon.png")))
         self.resize(900, 600)
 
         logging.info("Loading UI via ui_initializer.setup()")
-        self.ui_initializer = gui.setup(self)
+        with metrics.span("startup.ui_setup"):
+            self.ui_initializer = gui.setup(self)
 
         if self.menuBar():
             self.menuBar().setNativeMenuBar(False)
 
-        self._bind_menu_actions()
+        with metrics.span("startup.bind_actions"):
+            self._bind_menu_actions()
         logging.info("Main window ready")
 
     def _bind_menu_actions(self):
@@ -97,6 +123,9 @@ class ApplicationWindow(QMainWindow):
 
     def closeEvent(self, event):
         logging.info("Application closing...")
+        profiling.stop()
+        if LOG_PIPELINE is not None:
+            LOG_PIPELINE.stop()   # flush queued records before the widgets go away
         super().closeEvent(event)
 
 
@@ -104,11 +133,13 @@ class ApplicationWindow(QMainWindow):
 # Main entrypoint
 # --------------------------------------------------------------------------
 def main():
+    init_session(sys.argv)
     QtWidgets.QApplication.setAttribute(QtCore.Qt.AA_EnableHighDpiScaling, True)
     QtWidgets.QApplication.setAttribute(QtCore.Qt.AA_UseHighDpiPixmaps, True)
     os.environ["QT_ENABLE_HIGHDPI_SCALING"] = "1"
 
-    app = QtWidgets.QApplication(sys.argv)
+    with metrics.span("startup.qapplication"):
+        app = QtWidgets.QApplication(sys.argv)
 
     # ---------------- NORMAL SPLASH (safe for builds) ----------------
     splash_img = base_path("resources/icons", "splash.png")
@@ -133,8 +164,9 @@ def main():
         time.sleep(0.03)
 
     # ---------------- MAIN WINDOW ----------------
-    win = ApplicationWindow()
-    win.show()
+    with metrics.span("startup.main_window"):
+        win = ApplicationWindow()
+        win.show()
 
     splash.showMessage("Ready", Qt.AlignBottom | Qt.AlignCenter, Qt.black)
     splash.finish(win)
@@ -142,4 +174,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Frozen (PyInstaller) pool workers start this executable again;
+    # freeze_support runs their job and exits before the GUI starts.
+    multiprocessing.freeze_support()
     main()
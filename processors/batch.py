@@ -0,0 +1,153 @@
+# /processors/batch.py
+"""
+Batch MVC computation across imported trials.
+
+Every (file, channel) pair becomes one mvc_matlab job on a process pool,
+so an MVC session uses all cores. Trials are the dicts emitted by
+LoadMat.matsImported (or one by one from LoadMat.trialImported):
+{"path", "data" (channels x samples), "labels"}.
+"""
+
+import math
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from config.defaults import BEST_OF
+from processors.processors import Processor
+
+
+def _mvc_job(channel, winsize):
+    """Worker entry point (module level so it can be pickled)."""
+    mvc, _ = Processor(winsize).mvc_matlab(channel)
+    return float(mvc)
+
+
+def select_best(values, best_of=BEST_OF):
+    """
+    Keep the ``best_of`` highest MVC trials per label.
+
+    values : dict label -> list of (path, mvc). NaN MVCs are ignored.
+    Returns dict label -> list of (path, mvc), highest first.
+    """
+    best = {}
+    for label, trials in values.items():
+        valid = [t for t in trials if not math.isnan(t[1])]
+        best[label] = sorted(valid, key=lambda t: t[1], reverse=True)[:best_of]
+    return best
+
+
+class BatchMVC:
+    """
+    Spread mvc_matlab over a process pool.
+
+    progress : optional callable(done, total, path, label), called in the
+        thread that runs run() as each job finishes.
+    """
+
+    def __init__(self, winsize=3, max_workers=None, best_of=BEST_OF, progress=None):
+        self.winsize = winsize
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.best_of = best_of
+        self.progress = progress
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Stop after the jobs already running; safe to call from any thread."""
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def run(self, trials):
+        """
+        Compute the MVC of every channel of every trial.
+
+        At most two jobs per worker are in flight; each channel is read
+        (and copied to float) only when its job is submitted, so lazy
+        (e.g. HDF5-backed) data stays on disk until then. A job that fails
+        records NaN for its channel and an entry in "errors".
+
+        Returns
+        -------
+        dict with
+            "values": label -> [(path, mvc), ...] for every finished job,
+            "best": label -> best_of highest [(path, mvc), ...],
+            "errors": [(path, label, message), ...] for failed jobs,
+            "cancelled": True if cancel() stopped the run early.
+        """
+        self._cancel.clear()
+        trials = [dict(t, data=_as_2d(t["data"])) for t in trials]
+        total = sum(t["data"].shape[0] for t in trials)
+        todo = _channels(trials)
+        values, errors = {}, []
+        pending = {}
+        done = 0
+
+        def finish(path, label, mvc=math.nan, error=None):
+            nonlocal done
+            if error is not None:
+                errors.append((path, label, f"{type(error).__name__}: {error}"))
+            values.setdefault(label, []).append((path, mvc))
+            done += 1
+            if self.progress:
+                self.progress(done, total, path, label)
+
+        def submit_next(executor):
+            for path, label, data, ch in todo:
+                try:
+                    # row indexing keeps lazy data on disk until this point
+                    channel = np.asarray(data[ch], dtype=float)
+                    pending[executor.submit(_mvc_job, channel, self.winsize)] = (path, label)
+                except Exception as e:
+                    finish(path, label, error=e)
+                    continue
+                return
+
+        executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            for _ in range(2 * self.max_workers):
+                submit_next(executor)
+            while pending and not self._cancel.is_set():
+                finished, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    path, label = pending.pop(fut)
+                    try:
+                        mvc, error = fut.result(), None
+                    except Exception as e:    # failed job or broken pool
+                        mvc, error = math.nan, e
+                    finish(path, label, mvc, error)
+                    if not self._cancel.is_set():
+                        submit_next(executor)
+        finally:
+            executor.shutdown(wait=not self._cancel.is_set(), cancel_futures=True)
+
+        # keep input order within each label regardless of completion order
+        order = {t["path"]: i for i, t in enumerate(trials)}
+        for trials_of_label in values.values():
+            trials_of_label.sort(key=lambda t: order.get(t[0], 0))
+        return {
+            "values": values,
+            "best": select_best(values, self.best_of),
+            "errors": errors,
+            "cancelled": self._cancel.is_set(),
+        }
+
+
+def _as_2d(data):
+    if getattr(data, "ndim", 0) != 2:
+        data = np.atleast_2d(np.asarray(data, dtype=float))
+    return data
+
+
+def _channels(trials):
+    """(path, label, data, row) for every channel, without reading any data."""
+    for trial in trials:
+        data = trial["data"]
+        labels = np.atleast_1d(trial.get("labels", []))
+        for ch in range(data.shape[0]):
+            label = str(labels[ch]) if ch < labels.size else f"channel {ch + 1}"
+            yield trial["path"], label, data, ch
@@ -0,0 +1,93 @@
+# /processors/cache.py
+"""
+Persistent, content-addressed cache of processed trials.
+
+Entries are keyed by the SHA-256 of the source file plus the processing
+parameters (Processor.winsize, SEMG_BAND, fs, window lengths), so a
+renamed or copied file still hits and any parameter change misses.
+Arrays are stored as plain .npy files and loaded memory-mapped, which
+makes a hit cost little more than opening the files. The cache directory
+is size-bounded with least-recently-used eviction (utilities.disk_cache).
+"""
+
+import hashlib
+import json
+
+import numpy as np
+
+from config.defaults import DEFAULT_SEMG_FREQUENCY, SEMG_BAND
+from utilities.disk_cache import DiskLRU, file_digest
+from utilities.path_utils import user_data_path
+
+
+# Bump when the processing chain changes in a way that alters results.
+CACHE_VERSION = 1
+DEFAULT_CACHE_BYTES = 2 * 2**30
+
+
+class ResultCache:
+    """
+    On-disk cache for Processor results of a whole trial.
+
+    Example:
+        cache = ResultCache()
+        mvc, movingrms = cache.mvc(path, data, processor)
+        envelopes = cache.clean_semg(path, data, processor, fs)
+    """
+
+    def __init__(self, root=None, max_bytes=DEFAULT_CACHE_BYTES):
+        root = root or user_data_path("cache", "results", create=True)
+        self.store = DiskLRU(root, max_bytes)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, path, kind, **params):
+        payload = {"file": file_digest(path), "kind": kind, "version": CACHE_VERSION, **params}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def mvc(self, path, data, processor):
+        """Cached Processor.mvc_matlab_batch(data) -> (mvc, movingrms)."""
+        key = self.key(path, "mvc", winsize=processor.winsize, band=SEMG_BAND,
+                       fs=DEFAULT_SEMG_FREQUENCY)
+        arrays = self._get_or_compute(key, lambda: dict(zip(
+            ("mvc", "movingrms"), processor.mvc_matlab_batch(data))))
+        return arrays["mvc"], arrays["movingrms"]
+
+    def clean_semg(self, path, data, processor, fs, rms_ms=50, hampel_ms=50):
+        """Cached Processor.clean_semg_batch(data, fs, ...) -> envelopes."""
+        key = self.key(path, "clean_semg", band=SEMG_BAND, fs=float(fs),
+                       rms_ms=rms_ms, hampel_ms=hampel_ms)
+        arrays = self._get_or_compute(key, lambda: {
+            "envelopes": processor.clean_semg_batch(data, fs, rms_ms, hampel_ms)})
+        return arrays["envelopes"]
+
+    def load(self, key, mmap_mode="r"):
+        """Return {name: array} for a cached entry, or None on a miss."""
+        entry = self.store.get(key)
+        if entry is None:
+            return None
+        try:
+            meta = json.loads((entry / "meta.json").read_text(encoding="utf-8"))
+            return {name: np.load(entry / f"{name}.npy", mmap_mode=mmap_mode)
+                    for name in meta["arrays"]}
+        except (OSError, ValueError, KeyError):
+            # truncated or foreign entry: treat as a miss
+            self.store.discard(key)
+            return None
+
+    def save(self, key, arrays):
+        tmp = self.store.new_entry()
+        for name, arr in arrays.items():
+            np.save(tmp / f"{name}.npy", np.asarray(arr))
+        (tmp / "meta.json").write_text(json.dumps({"arrays": list(arrays)}), encoding="utf-8")
+        self.store.commit(key, tmp)
+
+    def _get_or_compute(self, key, compute):
+        arrays = self.load(key)
+        if arrays is not None:
+            self.hits += 1
+            return arrays
+        self.misses += 1
+        arrays = compute()
+        self.save(key, arrays)
+        return arrays
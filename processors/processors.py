@@ -1,62 +1,103 @@
 # /processors/processors.py
 
-import math
 import numpy as np
-import os
-import pandas as pd
-from scipy.signal import butter, filtfilt
 
 
-# -- PYQT -----------------------
-from PyQt5.QtWidgets import QDialog, QFileDialog, QListWidgetItem, QMessageBox
-from PyQt5 import uic
-from PyQt5.QtGui import QIcon
-
 # -- CUSTOM ---------------------
-from config.defaults import DEFAULT_SEMG_FREQUENCY
-from utilities.path_utils import resource_path
-from utilities.path_utils import base_path
+from config.defaults import DEFAULT_SEMG_FREQUENCY, SEMG_BAND
+from processors.filters import bandpass_sos, design_filter, sos_padlen
+from processors.lowmem import CleaningWorkspace, clean_semg_lowmem
+from processors.segments import find_runs, runs_to_mask
+from processors.sliding import hampel, moving_rms_prefix, windowed_sum
+from processors.streaming import SEMGStream
+from utilities import metrics
 
 
 class Processor:
     
     def __init__(self, winsize=3):
         self.winsize = winsize
+        self.workspace = None   # CleaningWorkspace, created by clean_semg_lowmem
         
     @staticmethod  
+    @metrics.timed("processor.bandpass")
     def bandpass(x, fs, lo=20, hi=450, order=4):
-        b, a = butter(order, [lo, hi], btype="band", fs=fs)
-        return filtfilt(b, a, x)
+        return bandpass_sos(x, fs, lo, hi, order=order)
     
     
     @staticmethod
+    @metrics.timed("processor.hampel")
     def hampel_filter(x, win_samples=51, k=3.0):
-        x = np.asarray(x, float); n = x.size
-        w = int(win_samples) | 1; half = w // 2
-        y = x.copy()
-        for i in range(n):
-            lo = max(0, i - half); hi = min(n, i + half + 1)
-            seg = x[lo:hi]; med = np.median(seg)
-            mad = np.median(np.abs(seg - med)) + 1e-12
-            if abs(x[i] - med) > k * 1.4826 * mad:
-                y[i] = med
-        return y
+        return hampel(np.asarray(x, float), win_samples, k)
     
     @staticmethod
+    @metrics.timed("processor.rms")
     def moving_rms(x, win_samples):
+        x = np.asarray(x, float)
+        if x.ndim > 1:
+            # same centered, zero-padded window as np.convolve(mode="same")
+            sums, _ = windowed_sum(x**2, win_samples // 2, (win_samples - 1) // 2)
+            np.maximum(sums, 0.0, out=sums)
+            return np.sqrt(sums / win_samples)
         # centered window via convolution
         w = np.ones(win_samples) / win_samples
         return np.sqrt(np.convolve(x**2, w, mode="same"))
 
 
+    @metrics.timed("processor.clean_semg")
     def clean_semg(self, x, fs, rms_ms=50, hampel_ms=50):
         x = np.asarray(x, float)
         x = x[~np.isnan(x)]
         if x.size == 0:
             return x
+        return self._clean_semg_rows(x, fs, rms_ms, hampel_ms)
+
+    @metrics.timed("processor.clean_semg_batch")
+    def clean_semg_batch(self, X, fs, rms_ms=50, hampel_ms=50):
+        """
+        clean_semg for a (channels x samples) matrix in one pass.
+
+        NaN-free channels are filtered together along the sample axis.
+        Channels containing NaNs go through clean_semg on their own; their
+        envelope is left-aligned and padded with NaN to the full length.
+
+        Returns
+        -------
+        envelopes : np.ndarray (channels x samples) cleaned RMS envelopes.
+        """
+        X = np.atleast_2d(np.asarray(X, float))
+        out = np.full(X.shape, np.nan)
+        has_nan = np.isnan(X).any(axis=1)
+        if not has_nan.all():
+            out[~has_nan] = self._clean_semg_rows(X[~has_nan], fs, rms_ms, hampel_ms)
+        for c in np.flatnonzero(has_nan):
+            env = self.clean_semg(X[c], fs, rms_ms, hampel_ms)
+            out[c, :env.size] = env
+        return out
+
+    def clean_semg_lowmem(self, x, fs, rms_ms=50, hampel_ms=50, out=None):
+        """
+        Memory-economy clean_semg: float32 work buffers kept in
+        self.workspace and reused between calls. See processors.lowmem
+        for the peak-memory bound.
+        """
+        if self.workspace is None:
+            self.workspace = CleaningWorkspace(np.float32)
+        return clean_semg_lowmem(x, fs, rms_ms, hampel_ms, workspace=self.workspace, out=out)
+
+    def clean_semg_stream(self, fs, rms_ms=50, hampel_ms=50):
+        """
+        Streaming counterpart of clean_semg for live acquisition.
 
-        x = type(self).bandpass(x, fs, lo=50, hi=500)
-        x = np.abs(x) 
+        Returns a processors.streaming.SEMGStream; see that module for how
+        its causal output differs from this offline path.
+        """
+        return SEMGStream(fs, rms_ms=rms_ms, hampel_ms=hampel_ms)
+
+    def _clean_semg_rows(self, x, fs, rms_ms, hampel_ms):
+        x = type(self).bandpass(x, fs, lo=SEMG_BAND[0], hi=SEMG_BAND[1])
+        with metrics.span("processor.rectify"):
+            x = np.abs(x) 
         rms = type(self).moving_rms(x, max(1, int(fs * rms_ms / 1000)))
         rms_h = type(self).hampel_filter(rms, max(3, int(fs * hampel_ms / 1000)) | 1, k=3.0)
         return rms_h
@@ -64,7 +105,8 @@ class Processor:
     def energy_detection(self, in_audio: np.ndarray,
                          min_silence: float = 0.080,
                          min_sound: float = 0.200,
-                         fs: int = 44100):
+                         fs: int = 44100,
+                         return_segments: bool = False):
         """
         Time-domain energy detection (NumPy port of your MATLAB code).
     
@@ -74,11 +116,14 @@ class Processor:
         min_silence : float Minimum silence length in seconds. Default 0.080.
         min_sound : float Minimum sound length in seconds. Default 0.200.
         fs : int Sampling frequency. Default 44100.
+        return_segments : bool Also return the detected segments. Default False.
     
         Returns
         -------
         energy_vector : np.ndarray 0/1 mask (same length as input) where 1 marks detected sound.
         out_audio : np.ndarray in_audio multiplied by energy_vector (silence is zeroed).
+        segments : np.ndarray (k, 2) [start, stop) sample intervals of detected
+            sound. Only returned when return_segments is True.
         """
         x = np.asarray(in_audio).astype(float).ravel()
     
@@ -105,67 +150,81 @@ class Processor:
         energy_vector[moving_ave < 0.010] = 0
     
         # --- Enforce minimum sound length (remove short 1-runs)
-        cum = 0
-        for i in range(len(energy_vector)):
-            if energy_vector[i]:
-                cum += 1
-            else:
-                if 0 < cum < min_sound_samples:
-                    energy_vector[i - cum:i] = 0
-                cum = 0
-        # Handle a trailing run of ones
-        if 0 < cum < min_sound_samples:
-            energy_vector[len(energy_vector) - cum:len(energy_vector)] = 0
+        segments = find_runs(energy_vector)
+        segments = segments[segments[:, 1] - segments[:, 0] >= min_sound_samples]
+        energy_vector = runs_to_mask(segments, len(x))
     
         out_audio = x * energy_vector
+        if return_segments:
+            return energy_vector, out_audio, segments
         return energy_vector, out_audio
 
     def moving_rms_matlab(self, interval, halfwindow):
-        n = len(interval)
-        rms_signal = np.zeros(n)
-        for i in range(n):
-            small_index = max(0, i - halfwindow)
-            big_index   = min(n, i + halfwindow)
-            window_samples = interval[small_index:big_index]
-            rms_signal[i] = np.sqrt(np.sum(window_samples**2)/len(window_samples))
-        return rms_signal
+        return moving_rms_prefix(interval, halfwindow)
 
 
+    @metrics.timed("processor.mvc")
     def mvc_matlab(self, in_vec):
         x = np.asarray(in_vec, dtype=float)
         x = x[~np.isnan(x)]
         if x.size == 0:
             return np.nan, x  # nothing to do
-    
-        x = x - np.mean(x)
+        return self._mvc_rows(x)
+
+    @metrics.timed("processor.mvc_batch")
+    def mvc_matlab_batch(self, X):
+        """
+        mvc_matlab for a (channels x samples) matrix in one pass.
+
+        NaN handling is per channel, as in clean_semg_batch: channels with
+        NaNs are processed on their own and their envelope is padded with
+        NaN; an all-NaN channel yields an MVC of NaN.
+
+        Returns
+        -------
+        mvc : np.ndarray (channels,) MVC value per channel.
+        movingrms : np.ndarray (channels x samples) RMS envelopes.
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        mvc = np.full(X.shape[0], np.nan)
+        movingrms = np.full(X.shape, np.nan)
+        has_nan = np.isnan(X).any(axis=1)
+        if not has_nan.all() and X.shape[1]:
+            mvc[~has_nan], movingrms[~has_nan] = self._mvc_rows(X[~has_nan])
+        for c in np.flatnonzero(has_nan):
+            mvc[c], env = self.mvc_matlab(X[c])
+            movingrms[c, :env.size] = env
+        return mvc, movingrms
+
+    def _mvc_rows(self, x):
+        x = x - np.mean(x, axis=-1, keepdims=True)
     
         # Zero out obvious spikes
         signal_corrected = x.copy()
         signal_corrected[signal_corrected > 9800] = 0.0
     
         # Bandpass filter
-        fcutlow, fcuthigh = 50.0, 500.0
+        fcutlow, fcuthigh = SEMG_BAND
         if fcuthigh >= 0.5 * DEFAULT_SEMG_FREQUENCY:
             raise ValueError("fcuthigh must be < Nyquist")
-        b, a = butter(
-            N=4,
-            Wn=[fcutlow, fcuthigh],
-            btype="band",
-            fs=DEFAULT_SEMG_FREQUENCY
-        )
-    
-        # Ensure length is sufficient for filtfilt
-        padlen = 3 * max(len(a), len(b))
-        if signal_corrected.size <= padlen:
+        sos = design_filter(4, (fcutlow, fcuthigh), DEFAULT_SEMG_FREQUENCY)
+    
+        # Ensure length is sufficient for sosfiltfilt
+        if signal_corrected.shape[-1] <= sos_padlen(sos):
             # fall back to no filter or a simpler approach
             signal_bp = signal_corrected
         else:
-            signal_bp = filtfilt(b, a, signal_corrected)
+            from scipy.signal import sosfiltfilt   # scipy.signal loads on first use
+            with metrics.span("processor.bandpass"):
+                signal_bp = sosfiltfilt(sos, signal_corrected, axis=-1)
     
         # Rectify + RMS envelope
-        full_wave_rectified = np.abs(signal_bp)
-        movingrms = self.moving_rms_matlab(full_wave_rectified, self.winsize)
-    
-        MVC = np.nanmax(movingrms) if movingrms.size else np.nan
+        with metrics.span("processor.rectify"):
+            full_wave_rectified = np.abs(signal_bp)
+        with metrics.span("processor.rms"):
+            movingrms = self.moving_rms_matlab(full_wave_rectified, self.winsize)
+    
+        if not movingrms.shape[-1]:
+            return np.nan, movingrms
+        MVC = np.nanmax(movingrms, axis=-1)
         return MVC, movingrms
-    
\ No newline at end of file
@@ -0,0 +1,25 @@
+# /processors/segments.py
+"""
+Run-length helpers for 0/1 detection masks.
+
+Segments are (start, stop) rows with ``stop`` exclusive, so
+``x[start:stop]`` is the detected part of the signal.
+"""
+
+import numpy as np
+
+
+def find_runs(mask):
+    """Return an (k, 2) int64 array with the [start, stop) of every run of ones."""
+    m = np.asarray(mask).ravel() != 0
+    edges = np.flatnonzero(np.diff(m.astype(np.int8), prepend=0, append=0))
+    return edges.reshape(-1, 2).astype(np.int64, copy=False)
+
+
+def runs_to_mask(runs, n, dtype=int):
+    """Inverse of find_runs: build a length-``n`` 0/1 mask from segments."""
+    marks = np.zeros(n + 1, dtype=np.int64)
+    runs = np.asarray(runs, dtype=np.int64).reshape(-1, 2)
+    np.add.at(marks, runs[:, 0], 1)
+    np.add.at(marks, runs[:, 1], -1)
+    return np.cumsum(marks[:-1]).astype(dtype, copy=False)
@@ -0,0 +1,191 @@
+# /processors/sliding.py
+"""
+Sliding-window statistics used by processors.Processor.
+
+All functions work along the last axis, so a 1-D signal and a
+(channels x samples) matrix go through the same code path.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# Number of window elements handled per block. Bounds the temporary
+# (rows x window) arrays to a few MB regardless of signal length.
+BLOCK_ELEMENTS = 1 << 18
+
+# Prefix sums are restarted every BLOCK_SAMPLES outputs. Differences of a
+# cumulative sum lose precision in proportion to the running total, so
+# re-anchoring keeps the rounding error bounded by the block, not by the
+# length of the recording.
+BLOCK_SAMPLES = 1 << 16
+
+# Windows up to this length are summed directly (shifted adds), which is
+# as cheap as the prefix sums and free of cancellation error.
+DIRECT_MAX = 32
+
+
+def sliding_median_mad(x, win_samples):
+    """
+    Centered sliding median and median absolute deviation (MAD).
+
+    The window is forced odd (``win_samples | 1``). Near the edges it
+    shrinks to the samples that exist, exactly like slicing
+    ``x[max(0, i-half):min(n, i+half+1)]`` for every ``i``.
+
+    Returns
+    -------
+    med, mad : np.ndarray float arrays with the shape of ``x``.
+    """
+    x = np.asarray(x, float)
+    w = int(win_samples) | 1
+    med = np.empty_like(x)
+    mad = np.empty_like(x)
+
+    for start, m, d in _iter_median_mad(x, w):
+        stop = start + m.shape[-1]
+        med[..., start:stop] = m
+        mad[..., start:stop] = d
+    return med, mad
+
+
+def hampel(x, win_samples, k=3.0, out=None):
+    """
+    Hampel filter: replace samples further than ``k`` scaled MADs from the
+    sliding median by that median.
+
+    Same windows as sliding_median_mad, but the medians are consumed block
+    by block, so apart from ``out`` only O(block) temporaries are
+    allocated. float32 input stays float32. ``out`` must not overlap ``x``.
+    """
+    x = np.asarray(x)
+    if not np.issubdtype(x.dtype, np.floating):
+        x = x.astype(float)
+    if out is None:
+        out = np.empty_like(x)
+    w = int(win_samples) | 1
+    for start, m, d in _iter_median_mad(x, w):
+        stop = start + m.shape[-1]
+        xs = x[..., start:stop]
+        d += 1e-12
+        out[..., start:stop] = np.where(np.abs(xs - m) > k * 1.4826 * d, m, xs)
+    return out
+
+
+def _iter_median_mad(x, w):
+    """
+    Yield ``(start, med, mad)`` blocks covering every center of ``x``.
+
+    Full windows come in vectorized blocks, followed by the shrinking edge
+    windows one sample at a time (at most 2*half of them).
+    """
+    n = x.shape[-1]
+    half = w // 2
+    if n >= w:
+        yield from _iter_full_windows(x, w)
+    edges = range(n) if n < w else list(range(half)) + list(range(n - half, n))
+    for i in edges:
+        seg = x[..., max(0, i - half):min(n, i + half + 1)]
+        m = np.median(seg, axis=-1)
+        d = np.median(np.abs(seg - m[..., None]), axis=-1)
+        yield i, m[..., None], d[..., None]
+
+
+def _iter_full_windows(x, w):
+    """
+    Yield ``(center_start, med, mad)`` for every full odd window of ``x``.
+
+    ``center_start`` is the index of the first window center of the block.
+    Uses ``np.partition`` on strided views, so each block costs O(rows*w).
+    """
+    half = w // 2
+    n = x.shape[-1]
+    rows = max(1, BLOCK_ELEMENTS // (w * max(1, x[..., 0].size)))
+    for lo in range(0, n - w + 1, rows):
+        hi = min(n, lo + rows + w - 1)
+        view = sliding_window_view(x[..., lo:hi], w, axis=-1)
+        seg = np.partition(view, half, axis=-1)
+        m = seg[..., half].copy()
+        np.subtract(view, m[..., None], out=seg)
+        np.abs(seg, out=seg)
+        seg.partition(half, axis=-1)
+        yield lo + half, m, seg[..., half].copy()
+
+
+def windowed_sum(x, left, right, block=BLOCK_SAMPLES):
+    """
+    Sum of ``x[..., max(0, i-left):min(n, i+right+1)]`` for every ``i``.
+
+    O(n) via block-local prefix sums accumulated in float64, or by direct
+    shifted adds when the window is at most ``DIRECT_MAX`` samples.
+
+    Returns
+    -------
+    sums : np.ndarray float64 array with the shape of ``x``.
+    counts : np.ndarray 1-D number of samples in each window.
+    """
+    x = np.asarray(x)
+    n = x.shape[-1]
+    sums = np.empty(x.shape, dtype=np.float64)
+    counts = np.empty(n, dtype=np.int64)
+    if 0 < left + right + 1 <= DIRECT_MAX and left >= 0 and right >= 0:
+        pad = [(0, 0)] * (x.ndim - 1) + [(left, right)]
+        xp = np.pad(x.astype(np.float64, copy=False), pad)
+        sums[...] = xp[..., 0:n]
+        for k in range(1, left + right + 1):
+            sums += xp[..., k:k + n]
+        idx = np.arange(n)
+        counts[:] = np.minimum(n, idx + right + 1) - np.maximum(0, idx - left)
+        return sums, counts
+    for s in range(0, n, block):
+        e = min(n, s + block)
+        a = max(0, s - left); b = min(n, e + right)
+        csum = np.zeros(x.shape[:-1] + (b - a + 1,), dtype=np.float64)
+        np.cumsum(x[..., a:b], axis=-1, dtype=np.float64, out=csum[..., 1:])
+        idx = np.arange(s, e)
+        lo = np.clip(idx - left, 0, n) - a
+        hi = np.clip(idx + right + 1, 0, n) - a
+        hi = np.maximum(hi, lo)
+        sums[..., s:e] = csum[..., hi] - csum[..., lo]
+        counts[s:e] = hi - lo
+    return sums, counts
+
+
+def moving_rms_prefix(x, halfwindow):
+    """
+    RMS over the asymmetric window ``[i-halfwindow, i+halfwindow)``.
+
+    Edge windows shrink to the available samples and are normalized by
+    their actual length, matching ``Processor.moving_rms_matlab``.
+    """
+    x = np.asarray(x, float)
+    sums, counts = windowed_sum(x * x, halfwindow, halfwindow - 1)
+    # Cancellation can leave tiny negatives where the signal is all zeros
+    np.maximum(sums, 0.0, out=sums)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sums /= counts
+    return np.sqrt(sums, out=sums)
+
+
+def moving_rms_into(x, win_samples, out, block=BLOCK_SAMPLES):
+    """
+    Centered moving RMS written block by block into ``out`` (1-D).
+
+    Same zero-padded window as ``np.convolve(x**2, ones(w)/w, "same")``,
+    i.e. ``[i - w//2, i + (w-1)//2]`` divided by ``w``. Sums are
+    accumulated in float64 per block, so ``out`` may be float32 without
+    losing precision. ``out`` must not overlap ``x``.
+    """
+    n = x.shape[0]
+    w = int(win_samples)
+    left, right = w // 2, (w - 1) // 2
+    for s in range(0, n, block):
+        e = min(n, s + block)
+        seg = x[max(0, s - left):min(n, e + right)].astype(np.float64)
+        sums, _ = windowed_sum(seg * seg, left, right)
+        # drop the context samples read on either side of the block
+        sums = sums[s - max(0, s - left):][:e - s]
+        np.maximum(sums, 0.0, out=sums)
+        sums /= w
+        np.sqrt(sums, out=out[s:e], casting="same_kind")
+    return out
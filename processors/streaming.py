@@ -0,0 +1,132 @@
+# /processors/streaming.py
+"""
+Chunked, stateful counterpart of Processor.clean_semg for live sEMG.
+
+Pipeline per chunk: causal bandpass (sosfilt, state carried between
+chunks) -> full-wave rectification -> trailing moving RMS -> centered
+Hampel filter. Work per chunk is proportional to the chunk size and the
+state is bounded by the window lengths, independent of how long the
+stream runs.
+
+How the output differs from the offline clean_semg
+--------------------------------------------------
+- Bandpass: a single causal pass instead of zero-phase filtfilt, so the
+  signal is phase-shifted and attenuated by |H| rather than |H|^2. The
+  filter state is initialized to the steady state of the first sample
+  instead of the odd-extension padding filtfilt uses.
+- Moving RMS: the window is trailing, ``[j-w+1, j]``, where clean_semg
+  centers it. Given the same rectified input, streamed RMS sample ``j``
+  equals offline sample ``j - (w-1)//2``.
+- Hampel: identical windows, including the shrinking edge windows, but
+  a centered window needs ``half`` future samples. process() therefore
+  returns each value ``half`` samples late; flush() emits the remainder
+  with the shrinking right-edge windows.
+- NaNs are dropped from each chunk, as clean_semg drops them from the
+  whole recording.
+"""
+
+import numpy as np
+
+from config.defaults import SEMG_BAND
+from processors.filters import design_filter
+from processors.sliding import _iter_full_windows, windowed_sum
+
+
+class SEMGStream:
+    """
+    Feed chunks with process(), finish with flush().
+
+    The number of samples returned by process() lags the input by the
+    Hampel half window; after flush() the total output length equals the
+    number of non-NaN input samples.
+    """
+
+    def __init__(self, fs, rms_ms=50, hampel_ms=50, lo=SEMG_BAND[0], hi=SEMG_BAND[1], order=4, k=3.0):
+        self.fs = fs
+        self.k = k
+        self._sos = design_filter(order, (lo, hi), fs)   # imports scipy.signal
+        self._rms_w = max(1, int(fs * rms_ms / 1000))
+        self._hampel_w = max(3, int(fs * hampel_ms / 1000)) | 1
+        self.reset()
+
+    @property
+    def latency(self):
+        """Samples held back by the Hampel stage."""
+        return self._hampel_w // 2
+
+    def reset(self):
+        self._zi = None                              # bandpass state
+        self._sq_tail = np.zeros(self._rms_w - 1)    # last w-1 squared samples
+        self._buf = np.empty(0)                      # RMS still inside a Hampel window
+        self._buf_start = 0                          # stream index of _buf[0]
+        self._next = 0                               # next Hampel center to emit
+        self._total = 0                              # RMS samples seen so far
+
+    def process(self, chunk):
+        x = np.asarray(chunk, float).ravel()
+        x = x[~np.isnan(x)]
+        if x.size == 0:
+            return np.empty(0)
+
+        from scipy.signal import sosfilt, sosfilt_zi
+        if self._zi is None:
+            self._zi = sosfilt_zi(self._sos) * x[0]
+        y, self._zi = sosfilt(self._sos, x, zi=self._zi)
+        np.abs(y, out=y)
+        return self._hampel(self._rms(y))
+
+    def flush(self):
+        """Emit the held-back samples and reset the stream."""
+        half = self._hampel_w // 2
+        out = [self._hampel_at(c, max(0, c - half), min(self._total, c + half + 1))
+               for c in range(self._next, self._total)]
+        self.reset()
+        return np.array(out, dtype=float)
+
+    # ------------------------------------------------------------------
+    def _rms(self, y):
+        w = self._rms_w
+        ext = np.concatenate((self._sq_tail, y * y))
+        sums, _ = windowed_sum(ext, w - 1, 0)
+        self._sq_tail = ext[ext.size - (w - 1):]
+        sums = sums[w - 1:]
+        np.maximum(sums, 0.0, out=sums)
+        return np.sqrt(sums / w)
+
+    def _hampel(self, rms):
+        w = self._hampel_w
+        half = w // 2
+        self._buf = np.concatenate((self._buf, rms))
+        self._total += rms.size
+        stop = self._total - half        # centers whose window is complete
+        out = []
+
+        # Left edge: shrinking windows, only at the start of the stream
+        while self._next < min(half, stop):
+            c = self._next
+            out.append(np.atleast_1d(self._hampel_at(c, 0, c + half + 1)))
+            self._next += 1
+
+        # Interior: full windows
+        if stop > self._next:
+            seg = self._buf[self._next - half - self._buf_start:stop + half - self._buf_start]
+            x = seg[half:seg.size - half]
+            pos = 0
+            for _, med, mad in _iter_full_windows(seg, w):
+                xs = x[pos:pos + med.size]
+                mad += 1e-12
+                out.append(np.where(np.abs(xs - med) > self.k * 1.4826 * mad, med, xs))
+                pos += med.size
+            self._next = stop
+
+        keep = max(0, self._next - half)
+        self._buf = self._buf[keep - self._buf_start:]
+        self._buf_start = keep
+        return np.concatenate(out) if out else np.empty(0)
+
+    def _hampel_at(self, c, lo, hi):
+        seg = self._buf[lo - self._buf_start:hi - self._buf_start]
+        x = self._buf[c - self._buf_start]
+        med = np.median(seg)
+        mad = np.median(np.abs(seg - med)) + 1e-12
+        return med if abs(x - med) > self.k * 1.4826 * mad else x
@@ -1,7 +1,31 @@
-import logging, os
+import logging, os, threading
+from collections import deque
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QPlainTextEdit
 from .console_redirector import redirect_stdout
-from .email_utils import email_file, SENDER_EMAIL, RECIPIENT_EMAIL, APP_PASSWORD
+from .log_delivery import LogDelivery, log_files
+
+
+def attach_handler(handler):
+    """
+    Add ``handler`` to the root logger, or to the sinks of a queue-based
+    pipeline when one is installed (any root handler with add_sink, e.g.
+    utilities.log_queue.BoundedQueueHandler).
+    """
+    root = logging.getLogger()
+    for h in root.handlers:
+        if hasattr(h, "add_sink"):
+            h.add_sink(handler)
+            return
+    root.addHandler(handler)
+
+
+def detach_handler(handler):
+    root = logging.getLogger()
+    for h in root.handlers:
+        if hasattr(h, "remove_sink"):
+            h.remove_sink(handler)
+    root.removeHandler(handler)
 
 
 class QtPlainTextEditHandler(logging.Handler):
@@ -27,6 +51,83 @@ class QtPlainTextEditHandler(logging.Handler):
             # widget was deleted — remove handler to avoid future crashes
             logging.getLogger().removeHandler(self)
 
+
+class BufferedQtLogHandler(logging.Handler):
+    """
+    Logging handler that batches records into a QPlainTextEdit.
+
+    emit() may be called from any thread: it only formats the record and
+    appends it to a bounded queue. A QTimer in the GUI thread drains the
+    queue every ``interval_ms`` with a single appendPlainText, so a burst
+    of records costs one repaint per interval instead of one per record.
+    The widget keeps at most ``max_block_count`` lines; older lines (and
+    queued records beyond that many) are dropped, with a note saying how
+    many; 0 or None keeps everything, as with setMaximumBlockCount. Create
+    the handler in the GUI thread.
+    """
+
+    gui_only = True     # flush() touches the widget; pipelines leave it to the timer
+
+    def __init__(self, target, formatter=None, interval_ms=100, max_block_count=5000):
+        super().__init__()
+        self._target = target
+        self._pending = deque(maxlen=max_block_count or None)
+        self._dropped = 0
+        self._drop_lock = threading.Lock()
+        if formatter:
+            self.setFormatter(formatter)
+        if max_block_count and hasattr(target, "setMaximumBlockCount"):
+            target.setMaximumBlockCount(max_block_count)
+        self._timer = QTimer(target)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    def emit(self, record):
+        try:
+            msg = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self._pending) == self._pending.maxlen:
+            with self._drop_lock:
+                self._dropped += 1
+        self._pending.append(msg)
+
+    def flush(self):
+        """Write everything queued so far; call from the GUI thread only."""
+        if not self._pending or self._target is None:
+            return
+        lines = []
+        with self._drop_lock:
+            dropped, self._dropped = self._dropped, 0
+        if dropped:
+            lines.append(f"... {dropped} log line(s) dropped ...")
+        try:
+            while True:
+                lines.append(self._pending.popleft())
+        except IndexError:
+            pass
+        try:
+            sb = self._target.verticalScrollBar()
+            at_bottom = sb.value() >= sb.maximum() - 2
+            self._target.appendPlainText("\n".join(lines))
+            if at_bottom:
+                sb.setValue(sb.maximum())
+        except RuntimeError:
+            # widget was deleted — stop and detach
+            self._target = None
+            detach_handler(self)
+
+    def close(self):
+        try:
+            self._timer.stop()
+            self.flush()
+        except RuntimeError:
+            pass
+        super().close()
+
+
 class SBConsoleOutput:
     '''
     target:  the target QPlainTextEdit
@@ -41,11 +142,20 @@ class SBConsoleOutput:
         font-size: 10pt;
     }
     """
-    def __init__(self, target=None, style=None, formatter=None, send_button=None, logfile=None):
+    def __init__(self, target=None, style=None, formatter=None, send_button=None, logfile=None,
+                 max_block_count=5000, flush_interval_ms=100, delivery=None):
         self._target = target
         self._style = style or self.DEFAULT_STYLE
         self._formatter = formatter
         self._logfile = logfile 
+        self._max_block_count = max_block_count
+        self._flush_interval_ms = flush_interval_ms
+        self._handler = None
+        # background sender with an outbox next to the log (see log_delivery.py)
+        self._delivery = delivery
+        if self._delivery is None and self._logfile:
+            outbox = os.path.join(os.path.dirname(os.path.abspath(self._logfile)), "outbox")
+            self._delivery = LogDelivery(outbox)
     
         if self._target and hasattr(self._target, "setStyleSheet"):
             self._target.setStyleSheet(self._style)
@@ -85,21 +195,31 @@ class SBConsoleOutput:
         if hasattr(self._target, "setStyleSheet"):
             self._target.setStyleSheet(style or self._style or "")
 
+        if self._handler is not None:
+            detach_handler(self._handler)
+            self._handler.close()
+            self._handler = None
         if self._target:
-            handler = QtPlainTextEditHandler(self._target, formatter=self._formatter)
-            logging.getLogger().addHandler(handler)
+            self._handler = BufferedQtLogHandler(
+                self._target, formatter=self._formatter,
+                interval_ms=self._flush_interval_ms, max_block_count=self._max_block_count)
+            attach_handler(self._handler)
+
 
+    @property
+    def delivery(self):
+        return self._delivery
 
     def send_log(self):
-        """Send the current log file via email."""
+        """
+        Queue the current and rotated logs (and any session profiles) for
+        email delivery. Compression and sending run in the background;
+        returns True once the send has been scheduled. Archives that cannot
+        be delivered wait in logs/outbox and are retried on the next send.
+        """
         if not self._logfile or not os.path.exists(self._logfile):
             logging.error("send_log: No logfile available to send")
             return False
-    
-        success = email_file(
-            filepath=self._logfile,
-            recipient=RECIPIENT_EMAIL,
-            sender=SENDER_EMAIL,
-            password=APP_PASSWORD
-        )
-        return success
\ No newline at end of file
+        self._delivery.send(log_files(self._logfile))
+        logging.info("send_log: log delivery started")
+        return True
\ No newline at end of file
@@ -1,5 +1,5 @@
-import sys
-from PyQt5.QtCore import QObject, pyqtSignal
+import sys, threading, time
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
 
 class EmittingStream(QObject):
     text_written = pyqtSignal(str)
@@ -11,9 +11,137 @@ class EmittingStream(QObject):
     def flush(self):
         pass
 
-def redirect_stdout(target_signal):
-    """Redirects sys.stdout to the given signal."""
-    stream = EmittingStream()
+
+class BufferedEmittingStream(QObject):
+    """
+    Line-buffered replacement for sys.stdout that emits in batches.
+
+    write() may be called from any thread. Text is split into lines per
+    writing thread, so partial lines from different threads never mix;
+    complete lines are queued in the order they were finished. A QTimer
+    (GUI thread) emits everything queued as one ``text_written`` string
+    every ``interval_ms``, lines joined with "\\n" (blank lines kept), which
+    suits QPlainTextEdit.appendPlainText. ``tee`` streams (the original
+    stdout, a log file) receive every write immediately and unchanged;
+    those listed in ``owned`` are closed by close().
+
+    Text without a newline is not held back for long: flush() (e.g.
+    print(..., end="", flush=True)) queues the writing thread's unfinished
+    line, and drain() emits unfinished lines older than one interval. A
+    carriage return starts the unfinished line over, so "\\r" progress
+    updates keep only the latest text. Create the stream in the GUI thread.
+    """
+    text_written = pyqtSignal(str)
+
+    encoding = "utf-8"
+    errors = "replace"
+
+    def __init__(self, interval_ms=100, tee=(), owned=(), parent=None):
+        super().__init__(parent)
+        self._lock = threading.Lock()
+        self._partial = {}      # thread id -> [first write time, unfinished line pieces]
+        self._lines = []        # finished lines, in completion order
+        self._tee = [s for s in tee if s is not None]
+        self._owned = [s for s in owned if s is not None]
+        self._max_age = interval_ms / 1000
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.drain)
+        self._timer.start()
+
+    def write(self, text):
+        if not text:
+            return 0
+        with self._lock:
+            for stream in self._tee:
+                try:
+                    stream.write(text)
+                except (OSError, ValueError):
+                    pass
+            entry = self._partial.setdefault(threading.get_ident(), [0.0, []])
+            pieces = entry[1]
+            *complete, rest = text.replace("\r\n", "\n").split("\n")
+            for piece in complete:
+                if "\r" in piece:
+                    pieces.clear()
+                    piece = piece.rpartition("\r")[2]
+                pieces.append(piece)
+                self._lines.append("".join(pieces))
+                pieces.clear()
+            if "\r" in rest:
+                pieces.clear()
+                rest = rest.rpartition("\r")[2]
+            if rest:
+                if not pieces:
+                    entry[0] = time.monotonic()
+                pieces.append(rest)
+        return len(text)
+
+    def flush(self):
+        # print(flush=True) from any thread: queue that thread's unfinished line
+        with self._lock:
+            entry = self._partial.get(threading.get_ident())
+            if entry and entry[1]:
+                self._lines.append("".join(entry[1]))
+                entry[1].clear()
+            for stream in self._tee:
+                try:
+                    stream.flush()
+                except (OSError, ValueError):
+                    pass
+
+    def drain(self, partial=False):
+        """
+        Emit queued lines, plus unfinished lines older than one interval
+        (all of them with ``partial``); GUI thread only.
+        """
+        with self._lock:
+            lines, self._lines = self._lines, []
+            cutoff = time.monotonic() - self._max_age
+            for entry in self._partial.values():
+                if entry[1] and (partial or entry[0] <= cutoff):
+                    lines.append("".join(entry[1]))
+                    entry[1].clear()
+            if partial:
+                self._partial.clear()
+        if lines:
+            self.text_written.emit("\n".join(lines))
+
+    def close(self):
+        self._timer.stop()
+        self.drain(partial=True)
+        self.flush()
+        for stream in self._owned:
+            try:
+                stream.close()
+            except (OSError, ValueError):
+                pass
+        self._tee = [s for s in self._tee if s not in self._owned]
+        self._owned = []
+
+    def isatty(self):
+        return False
+
+    def writable(self):
+        return True
+
+
+def redirect_stdout(target_signal, tee=False, logfile=None, interval_ms=100):
+    """
+    Redirects sys.stdout to the given signal, in batches of whole lines.
+
+    tee : bool Also write to the stdout being replaced.
+    logfile : str Also append everything to this file (closed by stream.close()).
+    The previous stdout is kept as ``stream.original``.
+    """
+    streams, owned = [], []
+    if tee:
+        streams.append(sys.stdout)
+    if logfile:
+        owned.append(open(logfile, "a", encoding="utf-8", buffering=1))
+        streams += owned
+    stream = BufferedEmittingStream(interval_ms=interval_ms, tee=streams, owned=owned)
+    stream.original = sys.stdout
     stream.text_written.connect(target_signal)
     sys.stdout = stream
     return stream
@@ -18,9 +18,15 @@ def email_file(filepath,
                sender=SENDER_EMAIL,
                password=APP_PASSWORD,
                smtp_server=SMTP_SERVER,
-               port=SMTP_PORT):
+               port=SMTP_PORT,
+               use_ssl=True,
+               timeout=30):
     """
     Send a file as an email attachment.
+
+    use_ssl=False talks plain SMTP (e.g. to a local test server) and skips
+    login when no password is given. ``timeout`` bounds connect and every
+    socket operation, so an unreachable server fails instead of hanging.
     """
     if not os.path.isfile(filepath):
         logging.error(f"email_file: File not found -> {filepath}")
@@ -45,9 +51,14 @@ def email_file(filepath,
         msg.attach(part)
 
     try:
-        context = ssl.create_default_context()
-        with smtplib.SMTP_SSL(smtp_server, port, context=context) as server:
-            server.login(sender, password)
+        if use_ssl:
+            context = ssl.create_default_context()
+            server = smtplib.SMTP_SSL(smtp_server, port, context=context, timeout=timeout)
+        else:
+            server = smtplib.SMTP(smtp_server, port, timeout=timeout)
+        with server:
+            if password and (use_ssl or server.has_extn("auth")):
+                server.login(sender, password)
             server.sendmail(sender, recipient, msg.as_string())
         logging.info(f"Session log emailed to {recipient}")
         return True
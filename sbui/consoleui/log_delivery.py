@@ -0,0 +1,156 @@
+import glob, logging, os, threading, zipfile
+from datetime import datetime
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from .email_utils import email_file
+
+
+def log_files(logfile):
+    """app.log, its rotated copies (app.log.1, ...) and session profiles next to it."""
+    log_dir = os.path.dirname(os.path.abspath(logfile))
+    rotated = sorted(p for p in glob.glob(glob.escape(logfile) + ".*") if p[len(logfile) + 1:].isdigit())
+    profiles = sorted(glob.glob(os.path.join(log_dir, "profile-*")))
+    return [p for p in [logfile] + rotated + profiles if os.path.isfile(p)]
+
+
+def flush_logging(timeout=2.0):
+    """
+    Flush the root handlers. With a queue-based pipeline this waits until
+    the records logged so far have reached the sinks (flush_sinks).
+    Handlers marked ``gui_only`` are skipped; call from any thread.
+    """
+    for h in logging.getLogger().handlers:
+        if hasattr(h, "flush_sinks"):
+            h.flush_sinks(timeout)
+        elif not getattr(h, "gui_only", False):
+            h.flush()
+
+
+def build_archive(files, dest_dir):
+    """
+    Compress ``files`` into one zip in ``dest_dir``. zipfile streams each
+    file in chunks, so large logs are never held in memory. The archive is
+    written under a temporary name and renamed when complete.
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    name = f"logs-{datetime.now():%Y%m%d-%H%M%S-%f}.zip"
+    tmp = os.path.join(dest_dir, "." + name)
+    try:
+        with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as z:
+            for path in files:
+                z.write(path, os.path.basename(path))
+    except BaseException:
+        # pending() never matches the temporary name; don't leave it behind
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    final = os.path.join(dest_dir, name)
+    os.replace(tmp, final)
+    return final
+
+
+class LogDelivery(QObject):
+    """
+    Background, retrying delivery of log archives through an on-disk outbox.
+
+    send(files) runs on a worker thread: it waits for the logging pipeline
+    to catch up (flush_logging), compresses the files into ``outbox`` and
+    then tries to email every archive in the outbox, oldest first. Each
+    attempt has a socket timeout; failed attempts are retried ``retries``
+    times with exponential backoff. Archives that still fail stay in the
+    outbox and go out with the next send() or flush_outbox(). The outbox
+    keeps at most ``max_queued`` archives (oldest dropped).
+
+    Signals are emitted from the worker thread; connected slots on GUI
+    objects run in the GUI thread (queued connection).
+
+    email_kwargs are passed to email_file (recipient, smtp_server, port,
+    use_ssl, password, ...), e.g. a local SMTP server for testing.
+    """
+    sent = pyqtSignal(str)        # archive path, delivered and removed
+    queued = pyqtSignal(str)      # archive path, kept in the outbox
+    finished = pyqtSignal(int, int)   # delivered, still queued
+
+    def __init__(self, outbox, retries=3, backoff_s=2.0, timeout=20, max_queued=20,
+                 parent=None, **email_kwargs):
+        super().__init__(parent)
+        self.outbox = outbox
+        self.retries = retries
+        self.backoff_s = backoff_s
+        self.timeout = timeout
+        self.max_queued = max_queued
+        self.email_kwargs = email_kwargs
+        self._lock = threading.Lock()       # one delivery run at a time
+        self._stop = threading.Event()
+        self._thread = None
+
+    def pending(self):
+        return sorted(glob.glob(os.path.join(self.outbox, "logs-*.zip")))
+
+    def send(self, files):
+        """Archive ``files`` and deliver it (plus the outbox) in the background."""
+        return self._start(list(files))
+
+    def flush_outbox(self):
+        """Retry everything queued in the outbox in the background."""
+        return self._start([])
+
+    def _start(self, files):
+        self._stop.clear()
+        t = threading.Thread(target=self._run, args=(files,), name="log-delivery", daemon=True)
+        self._thread = t
+        t.start()
+        return t
+
+    def wait(self, timeout=None):
+        """Block until the current delivery run ends (tests, shutdown)."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        return True
+
+    def cancel(self):
+        """Stop retrying; what is left stays in the outbox."""
+        self._stop.set()
+
+    def _run(self, files):
+        with self._lock:
+            if files:
+                # the file sink runs on the logging thread; let it catch up
+                flush_logging()
+                try:
+                    build_archive(files, self.outbox)
+                except OSError as e:
+                    logging.error("Could not archive logs: %s", e)
+            self._trim()
+            delivered = 0
+            for path in self.pending():
+                if self._stop.is_set():
+                    break
+                if self._deliver(path):
+                    delivered += 1
+            self.finished.emit(delivered, len(self.pending()))
+
+    def _deliver(self, path):
+        for attempt in range(self.retries + 1):
+            if email_file(path, timeout=self.timeout, **self.email_kwargs):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                self.sent.emit(path)
+                return True
+            if attempt < self.retries and self._stop.wait(self.backoff_s * 2 ** attempt):
+                break
+        logging.warning("Log delivery failed; kept in outbox: %s", os.path.basename(path))
+        self.queued.emit(path)
+        return False
+
+    def _trim(self):
+        for path in self.pending()[:-self.max_queued or None]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
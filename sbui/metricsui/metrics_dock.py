@@ -0,0 +1,84 @@
+import logging
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import (QCheckBox, QDockWidget, QFileDialog, QHBoxLayout, QHeaderView,
+                             QPushButton, QTableWidget, QTableWidgetItem, QVBoxLayout, QWidget)
+
+from utilities import metrics
+
+
+class MetricsDock(QDockWidget):
+    """
+    Dockable view of utilities.metrics: one row per span name with count,
+    total, mean, p50, p95 and max (ms). Refreshes while visible; the
+    checkbox turns collection on and off, Export writes the JSON snapshot.
+    """
+
+    COLUMNS = ("Stage", "Count", "Total ms", "Mean ms", "p50 ms", "p95 ms", "Max ms")
+
+    def __init__(self, parent=None, refresh_ms=1000):
+        super().__init__("Metrics", parent)
+        self.setObjectName("metricsDock")
+
+        body = QWidget(self)
+        layout = QVBoxLayout(body)
+        layout.setContentsMargins(4, 4, 4, 4)
+
+        bar = QHBoxLayout()
+        self.chkEnabled = QCheckBox("Collect", body)
+        self.chkEnabled.setChecked(metrics.enabled())
+        self.chkEnabled.toggled.connect(metrics.enable)
+        self.btnReset = QPushButton("Reset", body)
+        self.btnReset.clicked.connect(self._reset)
+        self.btnExport = QPushButton("Export JSON…", body)
+        self.btnExport.clicked.connect(self.export_json)
+        bar.addWidget(self.chkEnabled)
+        bar.addStretch(1)
+        bar.addWidget(self.btnReset)
+        bar.addWidget(self.btnExport)
+        layout.addLayout(bar)
+
+        self.table = QTableWidget(0, len(self.COLUMNS), body)
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+        self.setWidget(body)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(refresh_ms)
+        self._timer.timeout.connect(self.refresh)
+        self.visibilityChanged.connect(self._on_visibility)
+
+    def _on_visibility(self, visible):
+        if visible:
+            self.refresh()
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+    def refresh(self):
+        self.chkEnabled.setChecked(metrics.enabled())
+        snap = metrics.snapshot()
+        self.table.setRowCount(len(snap))
+        for row, (name, s) in enumerate(snap.items()):
+            values = (name, s["count"], s["total_s"] * 1e3, s["mean_s"] * 1e3,
+                      s["p50_s"] * 1e3, s["p95_s"] * 1e3, s["max_s"] * 1e3)
+            for col, v in enumerate(values):
+                text = v if isinstance(v, str) else (str(v) if isinstance(v, int) else f"{v:.2f}")
+                item = QTableWidgetItem(text)
+                if col:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, col, item)
+
+    def _reset(self):
+        metrics.reset()
+        self.refresh()
+
+    def export_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export metrics", "metrics.json", "JSON (*.json)")
+        if not path:
+            return None
+        metrics.export_json(path)
+        logging.info("Metrics exported to %s", path)
+        return path
@@ -0,0 +1,33 @@
+# /tests/test_import_time.py
+"""
+Startup budget: building ApplicationWindow in a fresh interpreter must not
+import the modules that load on first use, and must stay within
+benchmarks/import_time.DEFAULT_BUDGET_MS. Skipped without Qt's offscreen
+platform.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("PyQt5.QtWidgets")
+
+from benchmarks import import_time
+
+
+def offscreen_available():
+    probe = "from PyQt5.QtWidgets import QApplication; QApplication(['probe'])"
+    env = {**os.environ, "QT_QPA_PLATFORM": "offscreen"}
+    proc = subprocess.run([sys.executable, "-c", probe], env=env, capture_output=True)
+    return proc.returncode == 0
+
+
+pytestmark = pytest.mark.skipif(not offscreen_available(), reason="Qt offscreen platform unavailable")
+
+
+def test_startup_within_budget_without_deferred_modules():
+    current = import_time.measure(1, "offscreen")
+    assert import_time.forbidden_modules(current["modules"]) == []
+    assert current["total"] * 1e3 < import_time.DEFAULT_BUDGET_MS
@@ -0,0 +1,139 @@
+# /tests/test_loaders.py
+"""
+Round-trip checks for the hand-written binary readers (loaders.mat5 and
+loaders.c3d_loader) against files written by scipy.io.savemat and by a
+minimal C3D writer.
+"""
+
+import struct
+
+import numpy as np
+import pytest
+
+from loaders import mat5
+from loaders.c3d_loader import is_c3d, load_c3d_trial
+from loaders.mat_loader import ANALOG_FIELDS, load_mat_trial
+
+scipy_io = pytest.importorskip("scipy.io")
+sparse = pytest.importorskip("scipy.sparse")
+
+LABELS = ["EMG1", "EMG22", "E3"]
+
+
+def qtm_export(path, data, compress):
+    """A QTM-like struct: the analog block plus sparse and marker fields around it."""
+    scipy_io.savemat(path, {"qtm": {
+        "File": "trial.qtm",
+        "Frames": 100,
+        "Trajectories": {"Labeled": {"Data": np.ones((2, 4, 100))}},
+        "Analog": {
+            "Data": data,
+            "Labels": np.array(LABELS),          # char matrix, space padded
+            "Frequency": 1500.0,
+            "Extra": sparse.eye(3, format="csc"),
+        },
+        "Force": sparse.random(4, 4, 0.5, format="csc", random_state=0),
+    }}, do_compression=compress)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+@pytest.mark.parametrize("dtype", [np.float64, np.int16, np.float32])
+def test_mat5_reads_selected_analog_fields(tmp_path, compress, dtype):
+    data = (np.random.default_rng(0).standard_normal((3, 500)) * 1000).astype(dtype)
+    path = tmp_path / "trial.mat"
+    qtm_export(path, data, compress)
+
+    name, value = mat5.read_variable(path, select=ANALOG_FIELDS)
+    assert name == "qtm"
+    assert list(value) == ["Analog"]
+    analog = value["Analog"]
+    assert sorted(analog) == ["Data", "Frequency", "Labels"]
+    assert analog["Data"].dtype == dtype
+    assert analog["Data"].flags["C_CONTIGUOUS"]
+    np.testing.assert_array_equal(analog["Data"], data)
+    assert [label.strip() for label in analog["Labels"]] == LABELS
+    assert float(np.squeeze(analog["Frequency"])) == 1500.0
+
+
+def test_mat5_rejects_selected_sparse(tmp_path):
+    path = tmp_path / "trial.mat"
+    qtm_export(path, np.zeros((3, 10)), compress=True)
+    with pytest.raises(mat5.UnsupportedMatFile):
+        mat5.read_variable(path)
+
+
+def test_load_mat_trial(tmp_path):
+    data = np.arange(30, dtype=np.int16).reshape(3, 10)
+    path = tmp_path / "trial.mat"
+    qtm_export(path, data, compress=True)
+
+    trial = load_mat_trial(str(path))
+    np.testing.assert_array_equal(trial["data"], data)
+    assert trial["labels"] == LABELS
+    assert trial["fs"] == 1500.0
+
+
+# --------------------------------------------------------------------------
+# C3D
+# --------------------------------------------------------------------------
+def write_c3d(path, analog, fs, spf, npoints=0, is_float=True, scale=None, offset=None, gen=1.0):
+    """Intel C3D with ANALOG/POINT parameters and ``npoints`` dummy markers."""
+    e = "<"
+    used, n = analog.shape
+    nframes = n // spf
+
+    def group(gid, name):
+        return struct.pack("bb", len(name), -gid) + name.encode() + struct.pack(e + "h", 3) + b"\0"
+
+    def param(gid, name, dtype, dims, payload):
+        body = struct.pack("bb", dtype, len(dims)) + bytes(dims) + payload + b"\0"
+        return struct.pack("bb", len(name), gid) + name.encode() + struct.pack(e + "h", len(body) + 2) + body
+
+    labels = [f"EMG{i + 1}" for i in range(used)]
+    params = group(1, "POINT") + group(2, "ANALOG")
+    params += param(1, "FRAMES", 2, [], struct.pack(e + "h", nframes))
+    params += param(2, "USED", 2, [], struct.pack(e + "h", used))
+    params += param(2, "RATE", 4, [], struct.pack(e + "f", fs))
+    params += param(2, "LABELS", -1, [4, used], "".join(labels).encode())
+    if scale is not None:
+        params += param(2, "SCALE", 4, [used], np.asarray(scale, e + "f4").tobytes())
+    if offset is not None:
+        params += param(2, "OFFSET", 2, [used], np.asarray(offset, e + "i2").tobytes())
+    params += param(2, "GEN_SCALE", 4, [], struct.pack(e + "f", gen))
+    params += struct.pack("bb", 0, 0)
+    blocks = (4 + len(params)) // 512 + 1
+    section = (bytes([1, 80, blocks, 84]) + params).ljust(blocks * 512, b"\0")
+
+    header = struct.pack(e + "BBhHHHH", 2, 0x50, npoints, used * spf, 1, nframes, 0)
+    header += struct.pack(e + "fHHf", -1.0 if is_float else 1.0, 2 + blocks, spf, fs / spf)
+    vt = np.dtype(e + ("f4" if is_float else "i2"))
+    frames = analog[:, :nframes * spf].T.reshape(nframes, spf * used)
+    points = np.full((nframes, npoints * 4), 7, vt)
+    body = np.concatenate([points, frames.astype(vt)], axis=1).astype(vt)
+    path.write_bytes(header.ljust(512, b"\0") + section + body.tobytes())
+    return labels
+
+
+def test_c3d_float_analog_is_a_view(tmp_path):
+    analog = np.random.default_rng(1).standard_normal((4, 200)).astype(np.float32)
+    path = tmp_path / "trial.c3d"
+    labels = write_c3d(path, analog, fs=2000.0, spf=20)
+
+    assert is_c3d(str(path))
+    trial = load_c3d_trial(str(path))
+    np.testing.assert_array_equal(trial["data"], analog)
+    assert not trial["data"].flags["OWNDATA"]      # view of the memory map
+    assert trial["labels"] == labels
+    assert trial["fs"] == pytest.approx(2000.0)
+
+
+def test_c3d_int_analog_with_markers_is_scaled(tmp_path):
+    raw = np.random.default_rng(2).integers(-2000, 2000, (2, 100)).astype(np.int16)
+    scale, offset, gen = [0.5, 2.0], [10, -3], 0.25
+    path = tmp_path / "trial.c3d"
+    write_c3d(path, raw, fs=1000.0, spf=10, npoints=3, is_float=False,
+              scale=scale, offset=offset, gen=gen)
+
+    trial = load_c3d_trial(str(path))
+    expected = (raw - np.array(offset)[:, None]) * (np.array(scale) * gen)[:, None]
+    np.testing.assert_allclose(trial["data"], expected, rtol=1e-6)
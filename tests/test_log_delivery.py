@@ -0,0 +1,149 @@
+# /tests/test_log_delivery.py
+"""
+LogDelivery against a local plain-SMTP stand-in (use_ssl=False): delivery
+empties the outbox, and an unreachable server keeps the archive there for
+the next flush_outbox(). Also checks that flushing the logging pipeline
+never touches GUI-only sinks from the listener thread.
+"""
+
+import logging
+import socket
+import socketserver
+import threading
+import zipfile
+
+import pytest
+
+pytest.importorskip("PyQt5.QtCore")
+
+from sbui.consoleui import log_delivery
+from sbui.consoleui.log_delivery import LogDelivery
+from utilities.log_queue import LogPipeline
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib.sendmail; keeps each message's DATA."""
+
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        self.reply("220 localhost test")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            cmd = line.decode(errors="replace").strip().upper()
+            if cmd.startswith("DATA"):
+                self.reply("354 end with <CRLF>.<CRLF>")
+                data = []
+                for line in iter(self.rfile.readline, b""):
+                    if line == b".\r\n":
+                        break
+                    data.append(line)
+                self.server.messages.append(b"".join(data).decode(errors="replace"))
+                self.reply("250 queued")
+            elif cmd.startswith("QUIT"):
+                self.reply("221 bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+@pytest.fixture
+def smtp_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SMTPHandler)
+    server.daemon_threads = True
+    server.messages = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def logfile(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text("session started\n", encoding="utf-8")
+    return str(path)
+
+
+def test_send_delivers_and_empties_outbox(tmp_path, logfile, smtp_server):
+    delivery = LogDelivery(str(tmp_path / "outbox"), retries=0, timeout=5, use_ssl=False,
+                           smtp_server="127.0.0.1", port=smtp_server.server_address[1])
+    delivery.send(log_delivery.log_files(logfile))
+    assert delivery.wait(10)
+
+    assert delivery.pending() == []
+    assert len(smtp_server.messages) == 1
+    assert "filename=logs-" in smtp_server.messages[0]
+
+
+def test_unreachable_server_keeps_archive_and_retries(tmp_path, logfile, smtp_server, monkeypatch):
+    attempts = []
+
+    def email_file(path, **kwargs):
+        attempts.append(kwargs["port"])
+        return real_email_file(path, **kwargs)
+
+    real_email_file = log_delivery.email_file
+    monkeypatch.setattr(log_delivery, "email_file", email_file)
+    down = free_port()
+    delivery = LogDelivery(str(tmp_path / "outbox"), retries=2, backoff_s=0.01, timeout=2,
+                           use_ssl=False, smtp_server="127.0.0.1", port=down)
+    delivery.send([logfile])
+    assert delivery.wait(10)
+
+    assert attempts == [down] * 3
+    (archive,) = delivery.pending()
+    with zipfile.ZipFile(archive) as z:
+        assert z.namelist() == ["app.log"]
+    assert smtp_server.messages == []
+
+    # server back: the queued archive goes out with the next flush
+    delivery.email_kwargs["port"] = smtp_server.server_address[1]
+    delivery.flush_outbox()
+    assert delivery.wait(10)
+    assert delivery.pending() == []
+    assert len(smtp_server.messages) == 1
+
+
+# --------------------------------------------------------------------------
+# Flushing the pipeline before archiving
+# --------------------------------------------------------------------------
+class _Sink(logging.Handler):
+    def __init__(self, gui_only):
+        super().__init__()
+        self.gui_only = gui_only
+        self.records = []
+        self.flushed = 0
+
+    def emit(self, record):
+        self.records.append(record.getMessage())
+
+    def flush(self):
+        self.flushed += 1
+
+
+def test_pipeline_flush_skips_gui_only_sinks():
+    file_sink, gui_sink = _Sink(gui_only=False), _Sink(gui_only=True)
+    pipeline = LogPipeline([file_sink, gui_sink])
+    logger = logging.getLogger("test_log_delivery")
+    logger.propagate = False
+    pipeline.install(logger, level=logging.INFO)
+    try:
+        logger.info("before archive")
+        assert pipeline.flush(5)
+        assert file_sink.records == ["before archive"]
+        assert file_sink.flushed == 1
+        assert gui_sink.flushed == 0
+    finally:
+        pipeline.stop()
+        logger.handlers.clear()
+        logger.propagate = True
@@ -0,0 +1,82 @@
+# /tests/test_lowmem.py
+"""
+clean_semg_lowmem: documented peak-memory bound, agreement with
+Processor.clean_semg, and reuse of the CleaningWorkspace buffers.
+"""
+
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from processors.lowmem import LOWMEM_OVERHEAD_BYTES, CleaningWorkspace, clean_semg_lowmem
+from processors.processors import Processor
+
+FS = 1500
+
+
+def semg(n, seed=0):
+    """Noise modulated by on/off contractions, plus sparse spikes."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) / FS
+    x = rng.standard_normal(n) * (0.05 + (np.sin(2 * np.pi * 0.5 * t) > 0)) * 200.0
+    x[rng.random(n) < 1e-4] += 5000.0
+    return x
+
+
+def assert_close(actual, desired, rel):
+    """Max error relative to the envelope's scale; filter rounding is absolute, not per sample."""
+    assert actual.shape == desired.shape
+    assert np.max(np.abs(actual - desired)) <= rel * np.max(np.abs(desired))
+
+
+def test_peak_memory_within_bound():
+    x = semg(2_000_000).astype(np.float32)
+    clean_semg_lowmem(x[:10_000], FS)          # filter design and scipy import, untraced
+    workspace = CleaningWorkspace(np.float32)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        clean_semg_lowmem(x, FS, workspace=workspace)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak <= 3 * x.size * x.itemsize + LOWMEM_OVERHEAD_BYTES
+
+
+def test_float64_matches_clean_semg():
+    x = semg(200_000, seed=1)
+    assert_close(clean_semg_lowmem(x, FS), Processor().clean_semg(x, FS), 1e-10)
+
+
+def test_float32_matches_clean_semg():
+    x = semg(200_000, seed=2).astype(np.float32)
+    out = Processor().clean_semg_lowmem(x, FS)
+    assert out.dtype == np.float32
+    assert_close(out, Processor().clean_semg(x.astype(float), FS), 1e-6)
+
+
+def test_nans_are_dropped_like_clean_semg():
+    x = semg(20_000, seed=3)
+    x[::997] = np.nan
+    assert_close(clean_semg_lowmem(x, FS), Processor().clean_semg(x, FS), 1e-10)
+
+
+def test_workspace_buffers_are_reused():
+    p = Processor()
+    x = semg(50_000, seed=4).astype(np.float32)
+    p.clean_semg_lowmem(x, FS)
+    a, b = p.workspace.buffers(x.size)
+    nbytes = p.workspace.nbytes
+
+    p.clean_semg_lowmem(x, FS)
+    p.clean_semg_lowmem(x[:20_000], FS)          # shorter: same buffers
+    a2, b2 = p.workspace.buffers(x.size)
+    assert np.shares_memory(a, a2) and np.shares_memory(b, b2)
+    assert p.workspace.nbytes == nbytes
+
+
+@pytest.mark.parametrize("n", [0, 1])
+def test_degenerate_lengths(n):
+    assert clean_semg_lowmem(np.full(n, np.nan), FS).size == 0
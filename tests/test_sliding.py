@@ -0,0 +1,143 @@
+# /tests/test_sliding.py
+"""
+The vectorized Hampel filter, moving RMS and run-length masking must match
+the per-sample loops they replaced (kept inline below), since MVC values
+and detection masks depend on them.
+"""
+
+import numpy as np
+import pytest
+
+from processors.processors import Processor
+from processors.segments import find_runs, runs_to_mask
+from processors.sliding import hampel, moving_rms_prefix, sliding_median_mad
+
+
+# --------------------------------------------------------------------------
+# Reference loops (original Processor implementations)
+# --------------------------------------------------------------------------
+def hampel_loop(x, win_samples=51, k=3.0):
+    x = np.asarray(x, float); n = x.size
+    w = int(win_samples) | 1; half = w // 2
+    y = x.copy()
+    for i in range(n):
+        lo = max(0, i - half); hi = min(n, i + half + 1)
+        seg = x[lo:hi]; med = np.median(seg)
+        mad = np.median(np.abs(seg - med)) + 1e-12
+        if abs(x[i] - med) > k * 1.4826 * mad:
+            y[i] = med
+    return y
+
+
+def median_mad_loop(x, win_samples):
+    x = np.asarray(x, float); n = x.size
+    half = (int(win_samples) | 1) // 2
+    med, mad = np.empty(n), np.empty(n)
+    for i in range(n):
+        seg = x[max(0, i - half):min(n, i + half + 1)]
+        med[i] = np.median(seg)
+        mad[i] = np.median(np.abs(seg - med[i]))
+    return med, mad
+
+
+def moving_rms_matlab_loop(interval, halfwindow):
+    n = len(interval)
+    rms_signal = np.zeros(n)
+    for i in range(n):
+        small_index = max(0, i - halfwindow)
+        big_index   = min(n, i + halfwindow)
+        window_samples = interval[small_index:big_index]
+        rms_signal[i] = np.sqrt(np.sum(window_samples**2)/len(window_samples))
+    return rms_signal
+
+
+def min_sound_loop(energy_vector, min_sound_samples):
+    energy_vector = energy_vector.copy()
+    cum = 0
+    for i in range(len(energy_vector)):
+        if energy_vector[i]:
+            cum += 1
+        else:
+            if 0 < cum < min_sound_samples:
+                energy_vector[i - cum:i] = 0
+            cum = 0
+    if 0 < cum < min_sound_samples:
+        energy_vector[len(energy_vector) - cum:len(energy_vector)] = 0
+    return energy_vector
+
+
+def spiky(n, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.standard_normal(n)
+    x[rng.random(n) < 0.05] += 50.0
+    return x
+
+
+# --------------------------------------------------------------------------
+# Hampel / sliding median
+# --------------------------------------------------------------------------
+@pytest.mark.parametrize("n", [1, 2, 5, 50, 2000])
+@pytest.mark.parametrize("w", [3, 4, 7, 51])
+def test_hampel_matches_loop(n, w):
+    x = spiky(n, seed=n + w)
+    np.testing.assert_array_equal(hampel(x, w), hampel_loop(x, w))
+    np.testing.assert_array_equal(Processor.hampel_filter(x, w), hampel_loop(x, w))
+
+
+@pytest.mark.parametrize("n, w", [(3, 7), (200, 9), (1000, 50)])
+def test_sliding_median_mad_matches_loop(n, w):
+    x = spiky(n, seed=w)
+    med, mad = sliding_median_mad(x, w)
+    ref_med, ref_mad = median_mad_loop(x, w)
+    np.testing.assert_array_equal(med, ref_med)
+    np.testing.assert_array_equal(mad, ref_mad)
+
+
+def test_hampel_2d_rows_match_loop():
+    X = np.stack([spiky(700, seed=s) for s in range(3)])
+    out = hampel(X, 21)
+    for row, x in zip(out, X):
+        np.testing.assert_array_equal(row, hampel_loop(x, 21))
+
+
+# --------------------------------------------------------------------------
+# Moving RMS (mvc_matlab envelope)
+# --------------------------------------------------------------------------
+@pytest.mark.parametrize("n", [1, 4, 7, 300, 5000])
+@pytest.mark.parametrize("halfwindow", [1, 2, 3])
+def test_moving_rms_prefix_matches_loop(n, halfwindow):
+    # windows under 8 samples (the MVC default winsize=3 gives 6) are
+    # summed in the same order as np.sum, so the result is bit-identical
+    x = np.abs(spiky(n, seed=n)) * 100
+    ref = moving_rms_matlab_loop(x, halfwindow)
+    np.testing.assert_array_equal(moving_rms_prefix(x, halfwindow), ref)
+    np.testing.assert_array_equal(Processor().moving_rms_matlab(x, halfwindow), ref)
+
+
+@pytest.mark.parametrize("n", [7, 300, 5000])
+@pytest.mark.parametrize("halfwindow", [10, 50])
+def test_moving_rms_prefix_long_windows_match_loop(n, halfwindow):
+    # from 8 samples on np.sum uses unrolled/pairwise partial sums; only the
+    # last bits may differ (direct adds up to DIRECT_MAX, prefix sums beyond)
+    x = np.abs(spiky(n, seed=n)) * 100
+    np.testing.assert_allclose(moving_rms_prefix(x, halfwindow),
+                               moving_rms_matlab_loop(x, halfwindow), rtol=1e-12)
+
+
+# --------------------------------------------------------------------------
+# Minimum sound length (energy_detection)
+# --------------------------------------------------------------------------
+@pytest.mark.parametrize("n", [0, 1, 9, 500])
+@pytest.mark.parametrize("min_len", [1, 3, 20])
+def test_run_filtering_matches_loop(n, min_len):
+    rng = np.random.default_rng(n * 31 + min_len)
+    mask = np.repeat(rng.integers(0, 2, n), rng.integers(1, 30, n))[:n].astype(int)
+    runs = find_runs(mask)
+    runs = runs[runs[:, 1] - runs[:, 0] >= min_len]
+    np.testing.assert_array_equal(runs_to_mask(runs, n), min_sound_loop(mask, min_len))
+
+
+@pytest.mark.parametrize("mask", [[1, 1, 1], [0, 0], [1, 0, 1], [0, 1, 1, 0, 1]])
+def test_find_runs_round_trip(mask):
+    mask = np.array(mask)
+    np.testing.assert_array_equal(runs_to_mask(find_runs(mask), mask.size), mask)
@@ -4,14 +4,12 @@ ui_initializer.py — minimal UI loader for MyApp Template
 Adds File, Help menus and opens local rendered docs (like mvc_calculator)
 """
 
-import os
-import sys
-import subprocess
-import urllib.request
-from urllib.parse import urljoin
+from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QAction, QMessageBox
 from PyQt5.QtGui import QKeySequence, QIcon
 from PyQt5 import uic
+from sbui.metricsui.metrics_dock import MetricsDock
+from utilities import metrics, profiling
 from utilities.path_utils import base_path
 
 
@@ -22,11 +20,13 @@ class UIInitializer:
 
     def setup_ui(self):
         # --- Load main UI ---
-        uic.loadUi(base_path("uis", "main.ui"), self.main_window)
+        with metrics.span("ui.load_main_ui"):
+            uic.loadUi(base_path("uis", "main.ui"), self.main_window)
         mw = self.main_window
 
         # --- Menus ---
         mw.file_menu = mw.menuBar().addMenu("&File")
+        mw.view_menu = mw.menuBar().addMenu("&View")
         mw.help_menu = mw.menuBar().addMenu("&Help")
         mw.menuBar().setStyleSheet("font-size: 10pt; font-family: 'Segoe UI';")
 
@@ -36,14 +36,27 @@ class UIInitializer:
         mw.exitAction.triggered.connect(mw.close)
         mw.file_menu.addAction(mw.exitAction)
 
+        # --- View: metrics panel (hidden until toggled) ---
+        mw.metricsDock = MetricsDock(mw)
+        mw.addDockWidget(Qt.RightDockWidgetArea, mw.metricsDock)
+        mw.metricsDock.hide()
+        mw.metricsAction = mw.metricsDock.toggleViewAction()
+        mw.metricsAction.setText("&Metrics")
+        mw.view_menu.addAction(mw.metricsAction)
+
         # --- Help actions ---
         mw.aboutAction = QAction("&About", mw)
         mw.docsAction = QAction("&Documentation", mw)
+        mw.profileAction = QAction("&Profile Session", mw)
+        mw.profileAction.setCheckable(True)
+        mw.profileAction.setChecked(profiling.is_active())
 
         mw.help_menu.addAction(mw.docsAction)
+        mw.help_menu.addAction(mw.profileAction)
         mw.help_menu.addAction(mw.aboutAction)
 
         mw.docsAction.triggered.connect(self.launch_help)
+        mw.profileAction.toggled.connect(self.toggle_profiling)
         mw.aboutAction.triggered.connect(self.show_about)
 
     # ----------------------------------------------------------------------
@@ -94,6 +107,21 @@ class UIInitializer:
             QMessageBox.critical(self.main_window, "Error", f"Could not open documentation:\n{e}")
 
 
+    # ----------------------------------------------------------------------
+    def toggle_profiling(self, on):
+        """Start or stop recording a session profile (written next to app.log)."""
+        if on:
+            profiling.start()
+            return
+        paths = profiling.stop()
+        if paths:
+            QMessageBox.information(
+                self.main_window,
+                "Profile saved",
+                "Session profile written to:\n\n" + "\n".join(paths) +
+                "\n\nUse Send Log to include it with the log."
+            )
+
     # ----------------------------------------------------------------------
     def show_about(self):
         QMessageBox.information(
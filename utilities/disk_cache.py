@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+utilities/disk_cache.py — size-bounded, least-recently-used directory cache
+
+Each entry is a subdirectory named after its key. Entries are written to a
+temporary directory and renamed into place, so readers never see a partial
+entry. The directory mtime records the last use; once the total size passes
+max_bytes the least recently used entries are removed.
+"""
+
+from __future__ import annotations
+import hashlib, os, shutil, tempfile
+from pathlib import Path
+
+
+_digest_memo: dict = {}
+
+
+def file_digest(path: str | os.PathLike, chunk: int = 1 << 20) -> str:
+    """SHA-256 of a file's content, memoized on (path, size, mtime)."""
+    st = os.stat(path)
+    memo_key = (os.path.realpath(path), st.st_size, st.st_mtime_ns)
+    digest = _digest_memo.get(memo_key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(chunk), b""):
+                h.update(block)
+        digest = _digest_memo[memo_key] = h.hexdigest()
+    return digest
+
+
+class DiskLRU:
+    def __init__(self, root: str | os.PathLike, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, key: str) -> Path:
+        return self.root / key
+
+    def get(self, key: str) -> Path | None:
+        """Return the entry directory and mark it used, or None on a miss."""
+        entry = self.path(key)
+        if not entry.is_dir():
+            return None
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        return entry
+
+    def new_entry(self) -> Path:
+        """Temporary directory to fill before commit()."""
+        return Path(tempfile.mkdtemp(prefix=".tmp-", dir=self.root))
+
+    def commit(self, key: str, tmp: Path) -> Path:
+        entry = self.path(key)
+        try:
+            os.replace(tmp, entry)
+        except OSError:
+            # another writer got there first (or the target is in use)
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.evict(keep=key)
+        return entry
+
+    def discard(self, key: str) -> None:
+        shutil.rmtree(self.path(key), ignore_errors=True)
+
+    def entries(self) -> list[tuple[float, int, Path]]:
+        """(last_used, size_bytes, path) of every committed entry."""
+        out = []
+        for entry in self.root.iterdir():
+            if not entry.is_dir() or entry.name.startswith(".tmp-"):
+                continue
+            try:
+                size = sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+                out.append((entry.stat().st_mtime, size, entry))
+            except OSError:
+                continue
+        return out
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, keep: str | None = None) -> None:
+        """Remove least recently used entries until the cache fits max_bytes."""
+        entries = sorted(self.entries(), key=lambda e: e[0])
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            if entry.name == keep:
+                continue
+            # memory-mapped files cannot be removed on Windows while in use
+            shutil.rmtree(entry, ignore_errors=True)
+            if not entry.exists():
+                total -= size
+
+    def clear(self) -> None:
+        for _, _, entry in self.entries():
+            shutil.rmtree(entry, ignore_errors=True)
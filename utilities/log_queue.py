@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+utilities/log_queue.py — asynchronous logging through one background thread
+
+The root logger gets a single BoundedQueueHandler; every sink (rotating
+file, console, Qt widget) is attached to a QueueListener thread instead,
+so logging.info() on a worker or GUI thread only formats the message and
+enqueues it. File I/O and rollover checks happen on the listener thread.
+
+The queue is bounded. When it is full the overflow policy decides:
+    "drop_oldest"  discard the oldest queued record (default)
+    "drop_new"     discard the record being logged
+    "block"        wait up to block_timeout seconds, then drop it
+Dropped records are counted and reported by a WARNING once there is room.
+
+flush() waits until every record queued so far has been written and the
+sinks are flushed (e.g. before the log file is archived). Sinks that may
+only be touched from the GUI thread set ``gui_only = True`` and are left
+to flush themselves (e.g. on a QTimer).
+
+Example:
+    pipeline = LogPipeline([RotatingFileHandler(...), logging.StreamHandler()])
+    pipeline.install()
+    ...
+    pipeline.flush()  # wait for the sinks to catch up
+    pipeline.stop()   # flushes; e.g. from closeEvent
+"""
+
+from __future__ import annotations
+import atexit, logging, queue, threading
+from logging.handlers import QueueHandler, QueueListener
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_new", "block")
+
+
+def flush_handlers(handlers):
+    """Flush ``handlers`` from the calling thread, skipping GUI-only sinks."""
+    for h in handlers:
+        if getattr(h, "gui_only", False):
+            continue
+        try:
+            h.flush()
+        except Exception:
+            pass
+
+
+class _FlushRequest:
+    """Queued behind pending records; the listener flushes its sinks and sets ``done``."""
+    __slots__ = ("done",)
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class BoundedQueueHandler(QueueHandler):
+    def __init__(self, q: queue.Queue, overflow: str = "drop_oldest", block_timeout: float = 0.1):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}")
+        super().__init__(q)
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self._lock_dropped = threading.Lock()
+        self.listener: QueueListener | None = None
+
+    def enqueue(self, record):
+        if self.dropped:
+            self._report_dropped()
+        try:
+            if self.overflow == "block":
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        if self.overflow == "drop_oldest":
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+        with self._lock_dropped:
+            self.dropped += 1
+
+    def _report_dropped(self):
+        with self._lock_dropped:
+            n, self.dropped = self.dropped, 0
+        if not n:
+            return
+        note = logging.LogRecord("logging", logging.WARNING, __file__, 0,
+                                 "%d log record(s) dropped: logging queue full", (n,), None)
+        try:
+            self.queue.put_nowait(self.prepare(note))
+        except queue.Full:
+            with self._lock_dropped:
+                self.dropped += n
+
+    def flush_sinks(self, timeout: float = 2.0) -> bool:
+        """
+        Block until the records queued before this call have reached the
+        sinks and the sinks are flushed. False if that took over ``timeout``.
+        """
+        listener = self.listener
+        if listener is None or getattr(listener, "_thread", None) is None:
+            # not running: the sinks are attached to the logger directly
+            flush_handlers(listener.handlers if listener is not None else ())
+            return True
+        request = _FlushRequest()
+        try:
+            self.queue.put(request, timeout=timeout)
+        except queue.Full:
+            return False
+        return request.done.wait(timeout)
+
+    # sinks added after start-up (e.g. the console widget) go to the listener
+    def add_sink(self, handler: logging.Handler):
+        if self.listener is not None:
+            self.listener.handlers = self.listener.handlers + (handler,)
+
+    def remove_sink(self, handler: logging.Handler):
+        if self.listener is not None:
+            self.listener.handlers = tuple(h for h in self.listener.handlers if h is not handler)
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self):
+        # the queue may be full; wait for the thread to make room
+        self.queue.put(self._sentinel)
+
+    def handle(self, record):
+        if isinstance(record, _FlushRequest):
+            flush_handlers(self.handlers)
+            record.done.set()
+            return
+        super().handle(record)
+
+
+class LogPipeline:
+    def __init__(self, handlers, maxsize: int = 10_000, overflow: str = "drop_oldest",
+                 formatter: logging.Formatter | None = None, block_timeout: float = 0.1):
+        self.queue = queue.Queue(maxsize)
+        self.handler = BoundedQueueHandler(self.queue, overflow, block_timeout)
+        for h in handlers:
+            if formatter is not None:
+                h.setFormatter(formatter)
+        self.listener = _Listener(self.queue, *handlers, respect_handler_level=True)
+        self.handler.listener = self.listener
+        self._root = None
+        self._running = False
+
+    @property
+    def sinks(self):
+        return self.listener.handlers
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """Wait for the queue to drain up to now and flush every sink."""
+        return self.handler.flush_sinks(timeout)
+
+    def install(self, logger: logging.Logger | None = None, level: int | None = logging.INFO):
+        """Replace ``logger``'s (default: root) handlers by the queue and start the listener."""
+        self._root = logger or logging.getLogger()
+        for h in list(self._root.handlers):
+            self._root.removeHandler(h)
+        self._root.addHandler(self.handler)
+        if level is not None:
+            self._root.setLevel(level)
+        self.listener.start()
+        self._running = True
+        atexit.register(self.stop)
+        return self
+
+    def stop(self):
+        """
+        Drain the queue, stop the listener thread and reattach the sinks to
+        the logger directly, so records logged during shutdown still land.
+        Safe to call more than once.
+        """
+        if not self._running:
+            return
+        self._running = False
+        self.handler._report_dropped()
+        self.listener.stop()
+        if self._root is not None:
+            self._root.removeHandler(self.handler)
+            for h in self.listener.handlers:
+                self._root.addHandler(h)
+        # records queued behind the sentinel while switching over
+        while True:
+            try:
+                self.listener.handle(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        for h in self.listener.handlers:
+            try:
+                h.flush()
+            except Exception:
+                pass
+        atexit.unregister(self.stop)
@@ -47,3 +47,24 @@ def writable_path(*parts: str, create: bool = False) -> str:
     if create:
         os.makedirs(path, exist_ok=True)
     return str(path)
+
+
+def user_data_path(*parts: str, create: bool = False) -> str:
+    """
+    Per-user writable location for logs and caches.
+    Frozen builds live in a read-only install folder, so this resolves
+    under %APPDATA%/<FRIENDLYVERSIONNAME without spaces>; from source it
+    is the same as writable_path().
+    """
+    if is_frozen():
+        try:
+            from config.defaults import FRIENDLYVERSIONNAME
+        except ImportError:
+            FRIENDLYVERSIONNAME = "MyApp Template"
+        root = Path(os.environ.get("APPDATA", os.getcwd()), FRIENDLYVERSIONNAME.replace(" ", ""))
+    else:
+        root = app_root()
+    path = root.joinpath(*parts)
+    if create:
+        os.makedirs(path, exist_ok=True)
+    return str(path)
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+utilities/profiling.py — record a profile of a user session
+
+While a session is active, cProfile traces the GUI (main) thread and
+tracemalloc traces every Python allocation. stop() writes both next to
+app.log:
+
+    profile-YYYYmmdd-HHMMSS.prof   raw cProfile data (snakeviz, pstats)
+    profile-YYYYmmdd-HHMMSS.txt    summary: top functions by cumulative
+                                   and own time, top allocation sites,
+                                   current/peak traced memory
+
+Only the latest KEEP_SESSIONS profiles are kept. Work done in worker
+threads or processes shows up as time spent waiting in the GUI thread.
+cProfile, pstats and tracemalloc are imported when a session starts, so
+importing this module costs nothing at startup.
+"""
+
+from __future__ import annotations
+import glob, io, logging, os, time
+
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 25
+TRACEMALLOC_FRAMES = 10
+KEEP_SESSIONS = 5
+
+_log_dir: str | None = None
+_session: "ProfileSession | None" = None
+
+
+class ProfileSession:
+    def __init__(self, log_dir: str):
+        self.log_dir = log_dir
+        import cProfile
+        self.stamp = time.strftime("%Y%m%d-%H%M%S")
+        self._profiler = cProfile.Profile()
+        self._own_tracemalloc = False
+        self._t0 = 0.0
+
+    def start(self):
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._own_tracemalloc = True
+        self._t0 = time.perf_counter()
+        self._profiler.enable()
+        return self
+
+    def stop(self) -> list[str]:
+        """Stop recording and write the profile files; return their paths."""
+        import tracemalloc
+        self._profiler.disable()
+        elapsed = time.perf_counter() - self._t0
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        current, peak = tracemalloc.get_traced_memory() if snapshot else (0, 0)
+        if self._own_tracemalloc:
+            tracemalloc.stop()
+
+        os.makedirs(self.log_dir, exist_ok=True)
+        base = os.path.join(self.log_dir, f"profile-{self.stamp}")
+        self._profiler.dump_stats(base + ".prof")
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(self._summary(elapsed, snapshot, current, peak))
+        prune(self.log_dir)
+        return [base + ".prof", base + ".txt"]
+
+    def _summary(self, elapsed, snapshot, current, peak) -> str:
+        import pstats
+        out = io.StringIO()
+        out.write(f"Session profile {self.stamp} — {elapsed:.1f} s recorded\n\n")
+        for key, title in (("cumulative", "cumulative time"), ("tottime", "own time")):
+            out.write(f"=== Top {TOP_FUNCTIONS} functions by {title} (GUI thread) ===\n")
+            pstats.Stats(self._profiler, stream=out).strip_dirs().sort_stats(key).print_stats(TOP_FUNCTIONS)
+        if snapshot is not None:
+            out.write(f"=== Top {TOP_ALLOCATIONS} allocation sites (live at stop) ===\n")
+            out.write(f"traced memory: current {current / 2**20:.1f} MiB, peak {peak / 2**20:.1f} MiB\n")
+            for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+                out.write(f"{stat.size / 2**10:10.1f} KiB {stat.count:8d} blocks  {stat.traceback}\n")
+        return out.getvalue()
+
+
+def configure(log_dir: str):
+    """Set where sessions are written (the directory holding app.log)."""
+    global _log_dir
+    _log_dir = log_dir
+
+
+def is_active() -> bool:
+    return _session is not None
+
+
+def start(log_dir: str | None = None) -> ProfileSession:
+    global _session
+    if _session is None:
+        _session = ProfileSession(log_dir or _log_dir or os.getcwd()).start()
+        logging.info("Profiling started")
+    return _session
+
+
+def stop() -> list[str]:
+    global _session
+    if _session is None:
+        return []
+    session, _session = _session, None
+    paths = session.stop()
+    logging.info("Profile written to %s", ", ".join(paths))
+    return paths
+
+
+def profile_files(log_dir: str | None = None) -> list[str]:
+    """Profile files in ``log_dir``, newest first."""
+    pattern = os.path.join(log_dir or _log_dir or os.getcwd(), "profile-*")
+    return sorted(glob.glob(pattern), reverse=True)
+
+
+def prune(log_dir: str, keep: int = KEEP_SESSIONS):
+    stamps = sorted({os.path.basename(p).split(".")[0] for p in profile_files(log_dir)}, reverse=True)
+    for stamp in stamps[keep:]:
+        for p in glob.glob(os.path.join(log_dir, stamp + ".*")):
+            try:
+                os.remove(p)
+            except OSError:
+                pass
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+utilities/shared_arrays.py — return large NumPy arrays from worker processes
+through shared memory instead of pickling them
+
+The receiving (GUI) process owns every block. A SharedArrayTransport
+listens on a multiprocessing.connection socket/pipe served by threads of
+that process; workers ask it for a block of the right size, copy their
+array in and return a SharedArrayHandle (name, shape, dtype). attach() turns handles
+back into ndarrays backed by the same memory, with no copy.
+
+Block lifetime:
+- allocated but not yet attached: owned by the transport; close()
+  releases them (e.g. after a cancelled import);
+- attached: owned by the array. The block is closed and unlinked when the
+  array and every view of it are garbage collected.
+
+Because the owner process holds every block open, this also works on
+Windows, where a block disappears with its last handle. Blocks are not
+reclaimed if the owning process is killed.
+
+Example (parent):
+    transport = SharedArrayTransport()
+    fut = pool.submit(shared_call, transport.address, load_trial, path)
+    trial = transport.attach(fut.result())
+    transport.close()
+"""
+
+from __future__ import annotations
+import os, sys, threading, weakref
+from collections import namedtuple
+from multiprocessing import resource_tracker, shared_memory
+from multiprocessing.connection import AuthenticationError, Client, Listener
+
+import numpy as np
+
+# Smaller arrays are cheaper to pickle than to round-trip through a block.
+SHARED_MIN_BYTES = 1 << 20
+
+SharedArrayHandle = namedtuple("SharedArrayHandle", "name shape dtype")
+
+_TRACK_ARG = sys.version_info >= (3, 13)
+
+
+# ------------------------------------------------------------------------------
+# Block helpers
+# ------------------------------------------------------------------------------
+def _open(name=None, size=0):
+    """
+    Create (name=None) or open a block without leaving it registered with
+    the resource tracker, which would otherwise unlink it when *this*
+    process exits. Ownership is handled by the transport instead.
+    """
+    create = name is None
+    if _TRACK_ARG:
+        return shared_memory.SharedMemory(name=name, create=create, size=size, track=False)
+    block = shared_memory.SharedMemory(name=name, create=create, size=size)
+    if os.name == "posix":
+        resource_tracker.unregister(block._name, "shared_memory")
+    return block
+
+
+def _release(block):
+    block.close()
+    if not _TRACK_ARG and os.name == "posix":
+        # unlink() unregisters the name; register it first to keep the tracker balanced
+        resource_tracker.register(block._name, "shared_memory")
+    try:
+        block.unlink()
+    except FileNotFoundError:
+        pass
+
+
+# ------------------------------------------------------------------------------
+# Owner side
+# ------------------------------------------------------------------------------
+class SharedArrayTransport:
+    """
+    Owner of the blocks workers write into. Workers reach it through an
+    authenticated multiprocessing.connection.Listener served by one accept
+    thread plus one thread per connected worker; the only request is
+    ("allocate", nbytes) -> block name.
+    """
+
+    def __init__(self, min_bytes=SHARED_MIN_BYTES):
+        self.min_bytes = int(min_bytes)
+        self._blocks = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._authkey = os.urandom(32)
+        self._listener = Listener(authkey=self._authkey)
+        self._accepter = threading.Thread(target=self._accept, name="shared-arrays", daemon=True)
+        self._accepter.start()
+
+    @property
+    def address(self):
+        """What workers need to reach this transport (pass it to shared_call)."""
+        return (self._listener.address, self._authkey, self.min_bytes)
+
+    def _accept(self):
+        while True:
+            try:
+                conn = self._listener.accept()
+            except (EOFError, AuthenticationError):
+                continue            # a client that failed the handshake
+            except OSError:
+                return
+            if self._closed:
+                conn.close()
+                return
+            threading.Thread(target=self._serve, args=(conn,), name="shared-arrays-conn",
+                             daemon=True).start()
+
+    def _serve(self, conn):
+        # one worker process; ends when the worker exits or closes the connection
+        with conn:
+            while True:
+                try:
+                    op, size = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    if op != "allocate":
+                        raise ValueError(f"unknown request {op!r}")
+                    reply = ("ok", self._allocate(size))
+                except Exception as e:
+                    reply = ("error", f"{type(e).__name__}: {e}")
+                try:
+                    conn.send(reply)
+                except OSError:
+                    return
+
+    def _allocate(self, size):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("shared array transport is closed")
+            block = _open(size=max(1, int(size)))
+            self._blocks[block.name] = block
+            return block.name
+
+    def attach(self, obj):
+        """Replace every SharedArrayHandle in ``obj`` (dicts, lists, tuples) by its array."""
+        return _walk(obj, lambda h: self._attach(h) if isinstance(h, SharedArrayHandle) else h)
+
+    def discard(self, obj):
+        """Release the blocks of every handle in ``obj`` without attaching them."""
+        def drop(h):
+            if isinstance(h, SharedArrayHandle):
+                with self._lock:
+                    block = self._blocks.pop(h.name, None)
+                if block is not None:
+                    _release(block)
+            return h
+        _walk(obj, drop)
+
+    def _attach(self, handle):
+        with self._lock:
+            block = self._blocks.pop(handle.name)
+        arr = np.ndarray(handle.shape, np.dtype(handle.dtype), buffer=block.buf)
+        weakref.finalize(arr, _release, block)
+        return arr
+
+    def close(self):
+        """Release blocks that were never attached and stop the accept thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            blocks, self._blocks = list(self._blocks.values()), {}
+        for block in blocks:
+            _release(block)
+        # accept() does not return when the listener is closed from another
+        # thread; wake it with a connection of our own first
+        if self._accepter.is_alive():
+            try:
+                Client(self._listener.address, authkey=self._authkey).close()
+            except OSError:
+                pass
+            self._accepter.join(timeout=1.0)
+        self._listener.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ------------------------------------------------------------------------------
+# Worker side
+# ------------------------------------------------------------------------------
+_connections = {}
+
+
+def _allocate(address, authkey, size):
+    conn = _connections.get(address)
+    if conn is None:
+        conn = _connections[address] = Client(address, authkey=authkey)
+    conn.send(("allocate", size))
+    status, value = conn.recv()
+    if status != "ok":
+        raise RuntimeError(f"shared array allocation failed: {value}")
+    return value
+
+
+def to_shared(arr, address):
+    """Copy ``arr`` into a block owned by the transport at ``address``; return its handle."""
+    addr, authkey, _ = address
+    arr = np.asarray(arr)
+    name = _allocate(addr, authkey, arr.nbytes)
+    block = _open(name)
+    try:
+        np.ndarray(arr.shape, arr.dtype, buffer=block.buf)[...] = arr
+    finally:
+        block.close()
+    return SharedArrayHandle(name, arr.shape, arr.dtype.str)
+
+
+def share_arrays(obj, address):
+    """Replace every large plain ndarray in ``obj`` by a SharedArrayHandle."""
+    min_bytes = address[2]
+
+    def share(a):
+        if type(a) is np.ndarray or isinstance(a, np.memmap):
+            if a.nbytes >= min_bytes and a.dtype.kind in "biufc":
+                return to_shared(a, address)
+        return a
+    return _walk(obj, share)
+
+
+def shared_call(address, fn, *args, **kwargs):
+    """Pool job wrapper: run ``fn`` and send its large arrays back through shared memory."""
+    return share_arrays(fn(*args, **kwargs), address)
+
+
+def _walk(obj, fn):
+    if isinstance(obj, dict):
+        return {k: _walk(v, fn) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_walk(v, fn) for v in obj]
+    if isinstance(obj, tuple) and not isinstance(obj, SharedArrayHandle):
+        return tuple(_walk(v, fn) for v in obj)
+    return fn(obj)